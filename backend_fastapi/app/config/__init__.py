@@ -1,2 +1,3 @@
 from .database import db, connect_to_mongo, close_mongo_connection
 from .settings import settings
+from .indexes import ensure_indexes
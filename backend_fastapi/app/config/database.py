@@ -1,6 +1,8 @@
+import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from typing import Optional
 from .settings import settings
+from .monitoring import pool_metrics, command_metrics
 
 
 class Database:
@@ -16,11 +18,32 @@ db = Database()
 async def connect_to_mongo():
     """Create database connection."""
     print(f"🔌 Connecting to MongoDB...")
-    db.client = AsyncIOMotorClient(settings.mongodb_url)
+    db.client = AsyncIOMotorClient(
+        settings.mongodb_url,
+        maxPoolSize=settings.mongodb_max_pool_size,
+        minPoolSize=settings.mongodb_min_pool_size,
+        maxIdleTimeMS=settings.mongodb_max_idle_time_ms,
+        waitQueueTimeoutMS=settings.mongodb_wait_queue_timeout_ms,
+        serverSelectionTimeoutMS=settings.mongodb_server_selection_timeout_ms,
+        socketTimeoutMS=settings.mongodb_socket_timeout_ms,
+        event_listeners=[pool_metrics, command_metrics],
+    )
     db.database = db.client[settings.database_name]
+    if settings.mongodb_warm_pool:
+        await warm_pool()
     print(f"✅ Connected to MongoDB: {settings.database_name}")
 
 
+async def warm_pool():
+    """Open min_pool_size connections up front so the first requests don't pay for them."""
+    connections = max(settings.mongodb_min_pool_size, 1)
+    try:
+        await asyncio.gather(*(db.client.admin.command("ping") for _ in range(connections)))
+        print(f"🔥 Warmed MongoDB pool with {connections} connections")
+    except Exception as exc:
+        print(f"⚠️  Could not warm MongoDB pool: {exc}")
+
+
 async def close_mongo_connection():
     """Close database connection."""
     if db.client:
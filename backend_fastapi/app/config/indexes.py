@@ -0,0 +1,64 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from .settings import settings
+
+
+# Indexes required by the service layer, keyed by collection
+INDEXES = {
+    "attendance": [
+        IndexModel(
+            [("employee_id", ASCENDING), ("date", ASCENDING)],
+            name="employee_date_unique",
+            unique=True,
+        ),
+        IndexModel([("date", DESCENDING), ("_id", DESCENDING)], name="date_desc"),
+    ],
+    "attendance_buckets": [
+        IndexModel(
+            [("employee_id", ASCENDING), ("month", ASCENDING)],
+            name="employee_month_unique",
+            unique=True,
+        ),
+        IndexModel([("month", DESCENDING), ("employee_id", DESCENDING)], name="month_employee"),
+    ],
+    "attendance_rollups": [
+        IndexModel(
+            [("employee_id", ASCENDING), ("month", ASCENDING)],
+            name="employee_month_unique",
+            unique=True,
+        ),
+    ],
+    "idempotency_keys": [
+        IndexModel(
+            [("created_at", ASCENDING)],
+            name="created_at_ttl",
+            expireAfterSeconds=settings.idempotency_ttl,
+        ),
+    ],
+    "employees": [
+        IndexModel([("employee_id", ASCENDING)], name="employee_id_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_desc"),
+    ],
+}
+
+
+async def ensure_indexes(database: AsyncIOMotorDatabase) -> dict:
+    """Create missing indexes and return the names created per collection."""
+    print("🗂️  Ensuring MongoDB indexes...")
+    created = {}
+    
+    for collection_name, indexes in INDEXES.items():
+        created[collection_name] = []
+        for index in indexes:
+            try:
+                name = await database[collection_name].create_indexes([index])
+                created[collection_name].extend(name)
+            except OperationFailure as exc:
+                # Existing duplicate data blocks a unique index; keep serving
+                print(f"⚠️  Could not create index {index.document['name']} on {collection_name}: {exc}")
+    
+    print("✅ Indexes ready")
+    return created
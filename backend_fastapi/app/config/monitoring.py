@@ -0,0 +1,173 @@
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+from pymongo import monitoring
+
+
+# Upper bounds (ms) of the checkout wait histogram buckets
+CHECKOUT_WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool listener recording checkout waits and pool usage.
+    
+    Motor runs driver calls on executor threads, and a checkout starts and
+    completes on the same thread, so start times are kept thread-locally.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+    
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.checked_out = 0
+            self.max_checked_out = 0
+            self.connections_open = 0
+            self.wait_total_ms = 0.0
+            self.wait_max_ms = 0.0
+            self.wait_buckets = [0] * (len(CHECKOUT_WAIT_BUCKETS_MS) + 1)
+    
+    def _wait_ms(self) -> float:
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        if started is None:
+            return 0.0
+        return (time.perf_counter() - started) * 1000
+    
+    def _record_wait(self, wait_ms: float) -> None:
+        self.wait_total_ms += wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+        for index, bound in enumerate(CHECKOUT_WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                self.wait_buckets[index] += 1
+                return
+        self.wait_buckets[-1] += 1
+    
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+    
+    def connection_checked_out(self, event):
+        wait_ms = self._wait_ms()
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            self._record_wait(wait_ms)
+    
+    def connection_check_out_failed(self, event):
+        wait_ms = self._wait_ms()
+        with self._lock:
+            self.checkout_failures += 1
+            self._record_wait(wait_ms)
+    
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+    
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_open += 1
+    
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_open = max(self.connections_open - 1, 0)
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_ready(self, event):
+        pass
+    
+    def snapshot(self) -> dict:
+        """Return the current pool metrics."""
+        with self._lock:
+            completed = self.checkouts + self.checkout_failures
+            buckets = {f"le_{bound}ms": count for bound, count in zip(CHECKOUT_WAIT_BUCKETS_MS, self.wait_buckets)}
+            buckets["gt_{}ms".format(CHECKOUT_WAIT_BUCKETS_MS[-1])] = self.wait_buckets[-1]
+            return {
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "connections_open": self.connections_open,
+                "wait_avg_ms": round(self.wait_total_ms / completed, 3) if completed else 0.0,
+                "wait_max_ms": round(self.wait_max_ms, 3),
+                "wait_buckets": buckets,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class RequestStats:
+    """Per-request timings collected while a request is being handled."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.route: Optional[str] = None
+        self.db_commands = 0
+        self.db_time_ms = 0.0
+        self.handler_ms = 0.0
+        self.endpoint_ms = 0.0
+        # Encoding done inside the endpoint by fast_response
+        self.encoding_ms = 0.0
+    
+    def record_command(self, duration_micros: int) -> None:
+        with self._lock:
+            self.db_commands += 1
+            self.db_time_ms += duration_micros / 1000
+    
+    @property
+    def serialization_ms(self) -> float:
+        """Validation and encoding time, in the route handler or via fast_response."""
+        return max(self.handler_ms - self.endpoint_ms, 0.0) + self.encoding_ms
+
+
+# Stats for the request being handled; Motor copies the context into its
+# executor threads, so command events see the request that issued them
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Command listener attributing MongoDB round trips to the current request."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.commands = 0
+        self.failures = 0
+    
+    def _record(self, event, failed: bool) -> None:
+        with self._lock:
+            self.commands += 1
+            if failed:
+                self.failures += 1
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.record_command(event.duration_micros)
+    
+    def started(self, event):
+        pass
+    
+    def succeeded(self, event):
+        self._record(event, failed=False)
+    
+    def failed(self, event):
+        self._record(event, failed=True)
+
+
+command_metrics = CommandMetrics()
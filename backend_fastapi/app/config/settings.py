@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -8,10 +8,95 @@ class Settings(BaseSettings):
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
+    workers: int = 1
+    graceful_shutdown_timeout: int = 30
     
     # MongoDB
     mongodb_url: str = "mongodb://localhost:27017"
     database_name: str = "hrms_lite"
+    ensure_indexes: bool = True
+    
+    # MongoDB connection pool and timeouts
+    mongodb_max_pool_size: int = 100
+    mongodb_min_pool_size: int = 10
+    mongodb_max_idle_time_ms: int = 300000
+    mongodb_wait_queue_timeout_ms: int = 2000
+    mongodb_server_selection_timeout_ms: int = 5000
+    mongodb_socket_timeout_ms: int = 10000
+    mongodb_warm_pool: bool = True
+    
+    # Pagination
+    default_page_size: int = 100
+    max_page_size: int = 1000
+    
+    # Attendance storage: "daily" (one document per employee per day) or
+    # "bucketed" (one document per employee per month)
+    attendance_storage: Literal["daily", "bucketed"] = "daily"
+    
+    # Export
+    export_batch_size: int = 2000
+    
+    # Bulk writes
+    max_bulk_size: int = 5000
+    bulk_write_concurrency: int = 16
+    import_chunk_size: int = 1000
+    
+    # Employee deletes: "cascade" deletes history inline, "tombstone" returns
+    # immediately and purges attendance in the background, "transaction"
+    # deletes everything atomically (replica set only)
+    employee_delete_mode: Literal["cascade", "tombstone", "transaction"] = "cascade"
+    purge_batch_size: int = 1000
+    
+    # Caching (seconds; 0 disables)
+    dashboard_cache_ttl: float = 5.0
+    employee_cache_ttl: float = 300.0
+    employee_cache_size: int = 10000
+    
+    # Share one in-flight query between concurrent identical service reads
+    request_coalescing: bool = True
+    
+    # Cross-worker cache invalidation: "local" (single process), "capped"
+    # (tailed capped collection) or "change_stream" (replica set only)
+    invalidation_bus: Literal["local", "capped", "change_stream"] = "local"
+    invalidation_capped_size: int = 1048576
+    invalidation_retry_interval: float = 1.0
+    
+    # Build list responses without revalidation and encode them with orjson
+    fast_serialization: bool = True
+    
+    # Response compression (brotli when installed and accepted, else gzip)
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 4
+    
+    # Idempotency-Key support for POST /api/attendance and /api/employees:
+    # stored responses expire after the TTL (seconds); duplicates wait up to
+    # the lock timeout for the first request before getting 409
+    idempotency_enabled: bool = True
+    idempotency_ttl: int = 86400
+    idempotency_cache_size: int = 10000
+    idempotency_lock_timeout: float = 30.0
+    
+    # Server-Sent Events dashboard feed
+    live_feed_buffer_size: int = 64
+    live_feed_max_subscribers: int = 1000
+    live_feed_keepalive: float = 15.0
+    
+    # Admission control: concurrent requests per class (cheap reads, heavy
+    # list/export reads, writes) with a bounded wait queue; overflow and
+    # requests that wait longer than the timeout get 503 + Retry-After
+    admission_enabled: bool = True
+    admission_read_limit: int = 64
+    admission_heavy_limit: int = 8
+    admission_write_limit: int = 32
+    admission_queue_size: int = 128
+    admission_queue_timeout: float = 5.0
+    admission_retry_after: int = 1
+    
+    # Observability
+    metrics_enabled: bool = True
+    server_timing_header: bool = False
     
     # CORS
     frontend_url: str = "http://localhost:4200"
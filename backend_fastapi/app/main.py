@@ -3,9 +3,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 
-from .config.database import connect_to_mongo, close_mongo_connection
+from .config.database import connect_to_mongo, close_mongo_connection, get_database
+from .config.indexes import ensure_indexes
 from .config.settings import settings
-from .routes import employee_router, attendance_router
+from .routes import employee_router, attendance_router, diagnostics_router, metrics_router
+from .middleware.metrics import MetricsMiddleware
+from .middleware.compression import CompressionMiddleware
+from .middleware.admission import AdmissionMiddleware, admission_controller
+from .middleware.idempotency import IdempotencyMiddleware
+from .services.purge import purge_queue
+from .services.live import live_feed
+from .services.idempotency import idempotency_store
+from .services.invalidation import create_invalidation_bus
 
 
 @asynccontextmanager
@@ -13,8 +22,19 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
     await connect_to_mongo()
+    if settings.ensure_indexes:
+        await ensure_indexes(get_database())
+    app.state.invalidation_bus = create_invalidation_bus(settings.invalidation_bus)
+    await app.state.invalidation_bus.start(get_database())
+    await purge_queue.start(get_database())
+    live_feed.start(get_database())
+    idempotency_store.start(get_database())
     yield
     # Shutdown
+    idempotency_store.stop()
+    await live_feed.stop()
+    await purge_queue.stop()
+    await app.state.invalidation_bus.stop()
     await close_mongo_connection()
 
 
@@ -26,6 +46,20 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Replay the stored response for a repeated Idempotency-Key; innermost, so
+# replays are compressed per request and still counted by admission control
+if settings.idempotency_enabled:
+    app.add_middleware(IdempotencyMiddleware, store=idempotency_store)
+
+# Per-class concurrency limits with a bounded queue; added before CORS so
+# shed 503s still get CORS headers and are recorded by the metrics
+if settings.admission_enabled:
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission_controller,
+        retry_after=settings.admission_retry_after,
+    )
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -35,6 +69,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated gzip/brotli compression for larger and streamed responses
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.gzip_level,
+        brotli_quality=settings.brotli_quality,
+    )
+
+# Request latency and MongoDB round-trip metrics
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, server_timing=settings.server_timing_header)
+
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -74,9 +121,12 @@ async def health_check():
 # Include routers
 app.include_router(employee_router)
 app.include_router(attendance_router)
+app.include_router(diagnostics_router)
+app.include_router(metrics_router)
 
 
 # Run with: uvicorn app.main:app --reload
+# Production (multiple workers): python -m app.serve --workers 4
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
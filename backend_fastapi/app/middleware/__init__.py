@@ -0,0 +1,4 @@
+from .metrics import MetricsMiddleware, InstrumentedRoute, metrics_registry
+from .compression import CompressionMiddleware
+from .admission import AdmissionMiddleware, admission_controller
+from .idempotency import IdempotencyMiddleware
@@ -0,0 +1,176 @@
+import asyncio
+from typing import Dict, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..config.settings import settings
+
+
+# Reads that scan or stream many documents
+HEAVY_PATHS = {
+    "/api/employees",
+    "/api/attendance",
+    "/api/attendance/export",
+    "/api/attendance/matrix",
+    "/api/diagnostics/queries",
+    "/api/diagnostics/rollups",
+}
+
+# Cheap diagnostics stay reachable while the API is shedding load; the live
+# feed is a long-lived stream that would otherwise hold a read slot
+EXEMPT_PATHS = {
+    "/api/attendance/live",
+    "/api/diagnostics/pool",
+    "/api/diagnostics/cache",
+    "/api/diagnostics/purge",
+    "/api/diagnostics/admission",
+    "/api/diagnostics/live",
+    "/api/diagnostics/idempotency",
+}
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """Return the admission class of a request, or None if it is never limited.
+    
+    Only /api routes are limited; health checks, /metrics, the docs and
+    CORS preflights always go through.
+    """
+    path = path.rstrip("/") or "/"
+    if not path.startswith("/api/") or path in EXEMPT_PATHS or method == "OPTIONS":
+        return None
+    if method in WRITE_METHODS:
+        return "write"
+    if path in HEAVY_PATHS:
+        return "heavy"
+    return "read"
+
+
+class AdmissionLimiter:
+    """Concurrency limit with a bounded wait queue for one request class."""
+    
+    def __init__(self, limit: int, queue_size: int, queue_timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+    
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if needed; False means shed the request."""
+        if self._semaphore.locked():
+            if self.queued >= self.queue_size:
+                self.rejected_queue_full += 1
+                return False
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected_timeout += 1
+                return False
+            finally:
+                self.queued -= 1
+        else:
+            await self._semaphore.acquire()
+        self.active += 1
+        self.admitted += 1
+        return True
+    
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+    
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "queue_size": self.queue_size,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+        }
+
+
+class AdmissionController:
+    """Per-class limiters for cheap reads, heavy reads and writes.
+    
+    Limiters are created on first use so their semaphores bind to the
+    running event loop.
+    """
+    
+    def __init__(self, limits: Dict[str, int], queue_size: int, queue_timeout: float):
+        self.limits = limits
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._limiters: Dict[str, AdmissionLimiter] = {}
+    
+    def limiter(self, request_class: str) -> AdmissionLimiter:
+        if request_class not in self._limiters:
+            self._limiters[request_class] = AdmissionLimiter(
+                self.limits[request_class], self.queue_size, self.queue_timeout
+            )
+        return self._limiters[request_class]
+    
+    def stats(self) -> Dict[str, dict]:
+        """Return limiter counters keyed by request class."""
+        return {name: self.limiter(name).stats() for name in self.limits}
+
+
+admission_controller = AdmissionController(
+    limits={
+        "read": settings.admission_read_limit,
+        "heavy": settings.admission_heavy_limit,
+        "write": settings.admission_write_limit,
+    },
+    queue_size=settings.admission_queue_size,
+    queue_timeout=settings.admission_queue_timeout,
+)
+
+
+class AdmissionMiddleware:
+    """ASGI middleware shedding load with 503 + Retry-After once a class is saturated.
+    
+    Each request class has its own concurrency limit and bounded queue, so a
+    burst of exports cannot starve cheap reads or writes. A request is
+    rejected immediately when its queue is full, or after waiting
+    `queue_timeout` seconds for a slot.
+    """
+    
+    def __init__(self, app: ASGIApp, controller: AdmissionController, retry_after: int = 1):
+        self.app = app
+        self.controller = controller
+        self.retry_after = retry_after
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_class = classify(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if request_class is None:
+            await self.app(scope, receive, send)
+            return
+        
+        limiter = self.controller.limiter(request_class)
+        if not await limiter.acquire():
+            response = JSONResponse(
+                status_code=503,
+                content={
+                    "success": False,
+                    "message": "Server is busy, please retry shortly",
+                },
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -0,0 +1,143 @@
+import hashlib
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..services.idempotency import IdempotencyStore, BUSY, MISMATCH, REPLAY
+
+
+# Routes that honour an Idempotency-Key header
+IDEMPOTENT_ROUTES = {
+    ("POST", "/api/attendance"),
+    ("POST", "/api/employees"),
+}
+
+MAX_KEY_LENGTH = 255
+
+# Response headers that are recomputed on replay
+SKIPPED_HEADERS = {"content-length", "date", "server", "set-cookie"}
+
+
+def error_response(status_code: int, message: str, **headers: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"success": False, "message": message},
+        headers=headers or None,
+    )
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware replaying the first response for a repeated Idempotency-Key.
+    
+    Keys are scoped to the method and path. A duplicate gets the stored
+    status, headers and body plus `Idempotent-Replayed: true` without
+    reaching the route; a duplicate with a different body gets 422, and one
+    that outwaits the still-running original gets 409 + Retry-After.
+    Server errors are not stored, so a retry after a 5xx runs again.
+    """
+    
+    def __init__(self, app: ASGIApp, store: IdempotencyStore):
+        self.app = app
+        self.store = store
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or (scope["method"], scope["path"].rstrip("/")) not in IDEMPOTENT_ROUTES
+            or not self.store.running
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        idempotency_key = Headers(scope=scope).get("idempotency-key")
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            response = error_response(400, f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+            await response(scope, receive, send)
+            return
+        
+        # Buffer the body to fingerprint it, then hand it on unchanged
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        key = f"{scope['method']} {scope['path'].rstrip('/')} {idempotency_key}"
+        fingerprint = hashlib.sha256(body).hexdigest()
+        
+        outcome, stored = await self.store.begin(key, fingerprint)
+        if outcome == REPLAY:
+            await self.replay(stored, scope, receive, send)
+            return
+        if outcome == MISMATCH:
+            response = error_response(422, "Idempotency-Key was already used with a different request body")
+            await response(scope, receive, send)
+            return
+        if outcome == BUSY:
+            response = error_response(
+                409,
+                "A request with this Idempotency-Key is still in progress",
+                **{"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+        
+        body_sent = False
+        
+        async def receive_body() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+        
+        status_code = 500
+        headers = []
+        response_chunks = []
+        complete = False
+        
+        async def send_capturing(message: Message) -> None:
+            nonlocal status_code, headers, complete
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [
+                    [name.decode("latin-1"), value.decode("latin-1")]
+                    for name, value in message.get("headers", [])
+                    if name.decode("latin-1").lower() not in SKIPPED_HEADERS
+                ]
+            elif message["type"] == "http.response.body":
+                response_chunks.append(message.get("body", b""))
+                complete = not message.get("more_body", False)
+            await send(message)
+        
+        try:
+            await self.app(scope, receive_body, send_capturing)
+        except BaseException:
+            await self.store.abandon(key)
+            raise
+        
+        if complete and status_code < 500:
+            await self.store.complete(key, {
+                "fingerprint": fingerprint,
+                "status_code": status_code,
+                "headers": headers,
+                "body": b"".join(response_chunks),
+            })
+        else:
+            await self.store.abandon(key)
+    
+    async def replay(self, stored: dict, scope: Scope, receive: Receive, send: Send) -> None:
+        response = Response(
+            content=stored["body"],
+            status_code=stored["status_code"],
+            headers={name: value for name, value in stored["headers"]},
+        )
+        response.headers["Idempotent-Replayed"] = "true"
+        await response(scope, receive, send)
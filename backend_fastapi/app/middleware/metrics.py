@@ -0,0 +1,218 @@
+import asyncio
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, List, Tuple
+
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config.monitoring import RequestStats, current_request_stats, command_metrics, pool_metrics
+from ..services.coalesce import single_flight
+from .admission import admission_controller
+
+
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+DB_COMMAND_BUCKETS = [0, 1, 2, 5, 10, 25, 50, 100, 250]
+
+
+class Histogram:
+    """Cumulative histogram in the Prometheus exposition layout."""
+    
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+
+class MetricsRegistry:
+    """Per-route request metrics rendered as Prometheus text."""
+    
+    HISTOGRAMS = {
+        "hrms_request_duration_seconds": ("Total request latency", LATENCY_BUCKETS),
+        "hrms_request_db_seconds": ("Time spent in MongoDB commands per request", LATENCY_BUCKETS),
+        "hrms_request_serialization_seconds": ("Validation and serialization time per request", LATENCY_BUCKETS),
+        "hrms_request_db_commands": ("MongoDB commands issued per request", DB_COMMAND_BUCKETS),
+    }
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self._requests: Dict[Tuple[str, str, int], int] = {}
+    
+    def _histogram(self, name: str, method: str, route: str) -> Histogram:
+        key = (name, method, route)
+        if key not in self._histograms:
+            self._histograms[key] = Histogram(self.HISTOGRAMS[name][1])
+        return self._histograms[key]
+    
+    def observe(self, method: str, route: str, status_code: int, duration: float, stats: RequestStats) -> None:
+        with self._lock:
+            key = (method, route, status_code)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self._histogram("hrms_request_duration_seconds", method, route).observe(duration)
+            self._histogram("hrms_request_db_seconds", method, route).observe(stats.db_time_ms / 1000)
+            self._histogram("hrms_request_serialization_seconds", method, route).observe(stats.serialization_ms / 1000)
+            self._histogram("hrms_request_db_commands", method, route).observe(stats.db_commands)
+    
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP hrms_requests_total Requests handled",
+            "# TYPE hrms_requests_total counter",
+        ]
+        with self._lock:
+            for (method, route, status_code), count in sorted(self._requests.items()):
+                lines.append(f'hrms_requests_total{{method="{method}",route="{route}",status="{status_code}"}} {count}')
+            
+            for name, (help_text, _) in self.HISTOGRAMS.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, method, route), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    labels = f'method="{method}",route="{route}"'
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        
+        lines.extend([
+            "# HELP hrms_mongo_commands_total MongoDB commands completed",
+            "# TYPE hrms_mongo_commands_total counter",
+            f"hrms_mongo_commands_total {command_metrics.commands}",
+            "# HELP hrms_mongo_command_failures_total MongoDB commands that failed",
+            "# TYPE hrms_mongo_command_failures_total counter",
+            f"hrms_mongo_command_failures_total {command_metrics.failures}",
+        ])
+        pool = pool_metrics.snapshot()
+        lines.extend([
+            "# HELP hrms_mongo_pool_checked_out Connections currently checked out",
+            "# TYPE hrms_mongo_pool_checked_out gauge",
+            f"hrms_mongo_pool_checked_out {pool['checked_out']}",
+            "# HELP hrms_mongo_pool_checkout_failures_total Checkouts that failed or timed out",
+            "# TYPE hrms_mongo_pool_checkout_failures_total counter",
+            f"hrms_mongo_pool_checkout_failures_total {pool['checkout_failures']}",
+        ])
+        for name, help_text, counts in (
+            ("hrms_service_reads_issued_total", "Service reads that ran their own query", single_flight.issued),
+            ("hrms_service_reads_coalesced_total", "Service reads that joined an identical in-flight query", single_flight.coalesced),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for method, count in sorted(counts.items()):
+                lines.append(f'{name}{{method="{method}"}} {count}')
+        
+        admission = admission_controller.stats()
+        lines.extend([
+            "# HELP hrms_admission_in_flight Requests currently admitted per class",
+            "# TYPE hrms_admission_in_flight gauge",
+        ])
+        lines.extend(f'hrms_admission_in_flight{{class="{name}"}} {stats["active"]}' for name, stats in admission.items())
+        lines.extend([
+            "# HELP hrms_admission_queue_depth Requests waiting for a slot per class",
+            "# TYPE hrms_admission_queue_depth gauge",
+        ])
+        lines.extend(f'hrms_admission_queue_depth{{class="{name}"}} {stats["queued"]}' for name, stats in admission.items())
+        lines.extend([
+            "# HELP hrms_admission_rejections_total Requests shed with 503",
+            "# TYPE hrms_admission_rejections_total counter",
+        ])
+        for name, stats in admission.items():
+            lines.append(f'hrms_admission_rejections_total{{class="{name}",reason="queue_full"}} {stats["rejected_queue_full"]}')
+            lines.append(f'hrms_admission_rejections_total{{class="{name}",reason="timeout"}} {stats["rejected_timeout"]}')
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+
+class InstrumentedRoute(APIRoute):
+    """API route recording endpoint and handler time in the request stats."""
+    
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if asyncio.iscoroutinefunction(endpoint):
+            endpoint = self._timed(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+    
+    @staticmethod
+    def _timed(endpoint: Callable) -> Callable:
+        @wraps(endpoint)
+        async def timed_endpoint(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                stats = current_request_stats.get()
+                if stats is not None:
+                    stats.endpoint_ms += (time.perf_counter() - started) * 1000
+        
+        return timed_endpoint
+    
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route_path = self.path_format
+        
+        async def timed_handler(request):
+            started = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                stats = current_request_stats.get()
+                if stats is not None:
+                    stats.route = route_path
+                    stats.handler_ms += (time.perf_counter() - started) * 1000
+        
+        return timed_handler
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each request and its MongoDB round trips."""
+    
+    def __init__(self, app: ASGIApp, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    total_ms = (time.perf_counter() - started) * 1000
+                    header = (
+                        f"db;dur={stats.db_time_ms:.2f};desc=\"{stats.db_commands} commands\", "
+                        f"serialize;dur={stats.serialization_ms:.2f}, "
+                        f"total;dur={total_ms:.2f}"
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", header.encode("latin-1"))
+                    ]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            duration = time.perf_counter() - started
+            route = stats.route or getattr(scope.get("route"), "path", None) or "unmatched"
+            metrics_registry.observe(scope["method"], route, status_code, duration, stats)
+            current_request_stats.reset(token)
@@ -3,12 +3,16 @@ from .employee import (
     EmployeeResponse,
     EmployeeInDB,
     EmployeeListResponse,
+    EmployeeImportResponse,
 )
 from .attendance import (
     AttendanceCreate,
+    AttendanceBulkCreate,
+    AttendanceBulkResponse,
     AttendanceResponse,
     AttendanceInDB,
     AttendanceListResponse,
     AttendanceSummary,
+    AttendanceMatrixResponse,
     DashboardResponse,
 )
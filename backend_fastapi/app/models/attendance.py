@@ -1,14 +1,17 @@
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Literal
 from datetime import datetime, date
+from datetime import date as DateType
 from bson import ObjectId
 
+from ..config.settings import settings
+
 
 class AttendanceBase(BaseModel):
     """Base attendance model."""
     
     employee_id: str = Field(..., description="MongoDB ObjectId of the employee")
-    date: date = Field(..., description="Attendance date")
+    date: DateType = Field(..., description="Attendance date")
     status: Literal["Present", "Absent"] = Field(..., description="Attendance status")
     
     @field_validator("employee_id")
@@ -24,6 +27,17 @@ class AttendanceCreate(AttendanceBase):
     pass
 
 
+class AttendanceBulkCreate(BaseModel):
+    """Model for marking attendance for many employees at once."""
+    
+    records: List[AttendanceCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.max_bulk_size,
+        description="Attendance entries to mark",
+    )
+
+
 class EmployeeInfo(BaseModel):
     """Embedded employee info in attendance response."""
     
@@ -43,9 +57,10 @@ class AttendanceInDB(BaseModel):
     id: str = Field(..., alias="_id")
     employee: Optional[EmployeeInfo] = None
     date: date
-    status: str
-    created_at: datetime
-    updated_at: datetime
+    # Optional so records can be returned with a `fields=` projection
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
     
     class Config:
         populate_by_name = True
@@ -65,9 +80,35 @@ class AttendanceListResponse(BaseModel):
     
     success: bool = True
     count: int = 0
+    limit: Optional[int] = None
+    next_cursor: Optional[str] = None
     data: List[AttendanceInDB] = []
 
 
+class AttendanceBulkItemResult(BaseModel):
+    """Outcome of a single entry in a bulk attendance request."""
+    
+    index: int
+    employee_id: str
+    date: DateType
+    status: str
+    result: Literal["created", "updated", "skipped", "failed"]
+    id: Optional[str] = None
+    message: Optional[str] = None
+
+
+class AttendanceBulkResponse(BaseModel):
+    """API response model for bulk attendance marking."""
+    
+    success: bool = True
+    message: Optional[str] = None
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    data: List[AttendanceBulkItemResult] = []
+
+
 class AttendanceSummaryData(BaseModel):
     """Attendance summary statistics."""
     
@@ -94,6 +135,27 @@ class AttendanceSummary(BaseModel):
     data: Optional[dict] = None
 
 
+class AttendanceMatrixData(BaseModel):
+    """Employee x day attendance grid for one month.
+    
+    Each row is [_id, employee_id, full_name, days], where `days` holds one
+    character per day of the month as described by `legend`.
+    """
+    
+    month: str
+    days: int
+    legend: dict
+    columns: List[str]
+    rows: List[list] = []
+
+
+class AttendanceMatrixResponse(BaseModel):
+    """API response model for the monthly attendance matrix."""
+    
+    success: bool = True
+    data: Optional[AttendanceMatrixData] = None
+
+
 class TodayStats(BaseModel):
     """Today's attendance statistics."""
     
@@ -95,4 +95,26 @@ class EmployeeListResponse(BaseModel):
     
     success: bool = True
     count: int = 0
+    limit: Optional[int] = None
+    next_cursor: Optional[str] = None
     data: List[EmployeeInDB] = []
+
+
+class EmployeeImportRowError(BaseModel):
+    """A CSV row rejected by a bulk employee import."""
+    
+    row: int
+    employee_id: Optional[str] = None
+    email: Optional[str] = None
+    errors: List[str]
+
+
+class EmployeeImportResponse(BaseModel):
+    """API response model for a bulk employee import."""
+    
+    success: bool = True
+    message: Optional[str] = None
+    total_rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[EmployeeImportRowError] = []
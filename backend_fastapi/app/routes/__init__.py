@@ -1,2 +1,4 @@
 from .employee import router as employee_router
 from .attendance import router as attendance_router
+from .diagnostics import router as diagnostics_router
+from .metrics import router as metrics_router
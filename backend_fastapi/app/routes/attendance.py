@@ -1,21 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Literal
 from datetime import date
+import asyncio
+import csv
+import io
+import json
 
 from ..config.database import get_database
+from ..config.settings import settings
 from ..models.attendance import (
     AttendanceCreate,
+    AttendanceBulkCreate,
+    AttendanceBulkResponse,
     AttendanceResponse,
     AttendanceListResponse,
     AttendanceSummary,
+    AttendanceMatrixResponse,
     DashboardResponse,
     DashboardData,
     TodayStats,
 )
-from ..services.attendance import AttendanceService
+from ..services.attendance import AttendanceService, EXPORT_FIELDS
 from ..services.employee import EmployeeService
+from ..services.cache import collection_versions, dashboard_cache
+from ..services.live import live_feed
+from ..utils.responses import fast_response
+from ..utils.etag import make_etag, etag_matches, not_modified
+from ..middleware.metrics import InstrumentedRoute
 
-router = APIRouter(prefix="/api/attendance", tags=["Attendance"])
+router = APIRouter(prefix="/api/attendance", tags=["Attendance"], route_class=InstrumentedRoute)
+
+
+FIELDS_DESCRIPTION = "Comma-separated record fields to return (date, status, employee, created_at, updated_at)"
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated `fields` query parameter."""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()]
 
 
 def get_attendance_service():
@@ -32,24 +56,125 @@ def get_employee_service():
 
 @router.get("/dashboard", response_model=DashboardResponse)
 async def get_dashboard(
+    request: Request,
+    response: Response,
     attendance_service: AttendanceService = Depends(get_attendance_service),
     employee_service: EmployeeService = Depends(get_employee_service)
 ):
-    """Get dashboard summary statistics."""
-    total_employees = await employee_service.count()
-    today_stats = await attendance_service.get_today_stats()
-    department_stats = await employee_service.get_department_stats()
+    """Get dashboard summary statistics.
     
-    return DashboardResponse(
-        success=True,
-        data=DashboardData(
-            total_employees=total_employees,
-            today_stats=TodayStats(**today_stats),
-            department_stats=department_stats
+    Carries an ETag derived from today's date and the employee/attendance
+    write counters; a matching If-None-Match gets a 304 without any query.
+    """
+    # Read the versions before querying so a concurrent write yields a new
+    # tag; the cache shares the key, so data is only served under its own tag
+    today = date.today()
+    cache_key = (
+        today,
+        collection_versions.get("employees"),
+        collection_versions.get("attendance"),
+    )
+    etag = make_etag("dashboard", *cache_key)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    
+    cached = dashboard_cache.get(cache_key)
+    if cached:
+        return DashboardResponse(success=True, data=cached)
+    generation = dashboard_cache.generation
+    
+    # The queries are independent, so run them concurrently
+    total_employees, today_counts, department_stats = await asyncio.gather(
+        employee_service.count(),
+        attendance_service.get_today_counts(),
+        employee_service.get_department_stats(),
+    )
+    
+    data = DashboardData(
+        total_employees=total_employees,
+        today_stats=TodayStats(
+            date=today.isoformat(),
+            present=today_counts["present"],
+            absent=today_counts["absent"],
+            not_marked=max(total_employees - today_counts["present"] - today_counts["absent"], 0),
+        ),
+        department_stats=department_stats
+    )
+    dashboard_cache.set(cache_key, data, generation)
+    
+    return DashboardResponse(success=True, data=data)
+
+
+@router.get("/live")
+async def get_live_feed():
+    """Stream dashboard changes as Server-Sent Events.
+    
+    The first `counters` event carries today's stats; after that every
+    `attendance_marked`, `employee_created` and `employee_deleted` event
+    (and a `counters` event after bulk writes) includes the updated
+    `today` counters, so open dashboards no longer need to poll.
+    """
+    if not live_feed.accepting():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Live feed is not accepting subscribers"
         )
+    return StreamingResponse(
+        live_feed.stream(settings.live_feed_keepalive),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+@router.get("/export")
+async def export_attendance(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Export format"),
+    start_date: Optional[date] = Query(None, description="Start date for filtering"),
+    end_date: Optional[date] = Query(None, description="End date for filtering"),
+    service: AttendanceService = Depends(get_attendance_service)
+):
+    """Stream attendance records as NDJSON or CSV."""
+    async def ndjson_rows():
+        async for rows in service.iter_export_rows(start_date, end_date):
+            yield "".join(json.dumps(row) + "\n" for row in rows)
+    
+    async def csv_rows():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        async for rows in service.iter_export_rows(start_date, end_date):
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        if buffer.tell():
+            yield buffer.getvalue()
+    
+    if format == "csv":
+        return StreamingResponse(
+            csv_rows(),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=attendance.csv"},
+        )
+    return StreamingResponse(
+        ndjson_rows(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=attendance.ndjson"},
+    )
+
+
+@router.get("/matrix", response_model=AttendanceMatrixResponse)
+async def get_attendance_matrix(
+    month: str = Query(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Month as YYYY-MM"),
+    department: Optional[str] = Query(None, description="Limit to one department"),
+    service: AttendanceService = Depends(get_attendance_service)
+):
+    """Get a compact employee x day attendance grid for a month."""
+    matrix = await service.get_month_matrix(month, department)
+    return AttendanceMatrixResponse(success=True, data=matrix)
+
+
 @router.get("/summary/{employee_id}", response_model=AttendanceSummary)
 async def get_attendance_summary(
     employee_id: str,
@@ -65,30 +190,50 @@ async def get_employee_attendance(
     employee_id: str,
     start_date: Optional[date] = Query(None, description="Start date for filtering"),
     end_date: Optional[date] = Query(None, description="End date for filtering"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: AttendanceService = Depends(get_attendance_service)
 ):
     """Get attendance records for a specific employee."""
-    records = await service.get_by_employee(employee_id, start_date, end_date)
-    return AttendanceListResponse(
+    field_list = parse_fields(fields)
+    records = await service.get_by_employee(employee_id, start_date, end_date, field_list)
+    response = AttendanceListResponse.model_construct(
         success=True,
         count=len(records),
         data=records
     )
+    # Projected records omit the fields that were not requested
+    if field_list:
+        return fast_response(response, exclude_unset=True)
+    if settings.fast_serialization:
+        return fast_response(response)
+    return response
 
 
 @router.get("", response_model=AttendanceListResponse)
 async def get_all_attendance(
     start_date: Optional[date] = Query(None, description="Start date for filtering"),
     end_date: Optional[date] = Query(None, description="End date for filtering"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size, description="Page size"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     service: AttendanceService = Depends(get_attendance_service)
 ):
-    """Get all attendance records with optional date filtering."""
-    records = await service.get_all(start_date, end_date)
-    return AttendanceListResponse(
+    """Get a page of attendance records with optional date filtering."""
+    field_list = parse_fields(fields)
+    records, next_cursor = await service.get_all(start_date, end_date, cursor, limit, field_list)
+    response = AttendanceListResponse.model_construct(
         success=True,
         count=len(records),
+        limit=limit,
+        next_cursor=next_cursor,
         data=records
     )
+    # Projected records omit the fields that were not requested
+    if field_list:
+        return fast_response(response, exclude_unset=True)
+    if settings.fast_serialization:
+        return fast_response(response)
+    return response
 
 
 @router.post("", response_model=AttendanceResponse, status_code=status.HTTP_201_CREATED)
@@ -98,8 +243,34 @@ async def mark_attendance(
 ):
     """Mark attendance for an employee."""
     attendance = await service.mark_attendance(attendance_data)
+    live_feed.notify("attendance_marked", {
+        "employee_id": attendance_data.employee_id,
+        "date": attendance_data.date.isoformat(),
+        "status": attendance_data.status,
+    })
     return AttendanceResponse(
         success=True,
         message="Attendance marked successfully",
         data=attendance
     )
+
+
+@router.post("/bulk", response_model=AttendanceBulkResponse)
+async def mark_attendance_bulk(
+    bulk_data: AttendanceBulkCreate,
+    service: AttendanceService = Depends(get_attendance_service)
+):
+    """Mark attendance for many employees in one request."""
+    results = await service.mark_attendance_bulk(bulk_data.records)
+    counts = {outcome: 0 for outcome in ("created", "updated", "skipped", "failed")}
+    for result in results:
+        counts[result.result] += 1
+    if counts["created"] or counts["updated"]:
+        live_feed.refresh()
+    
+    return AttendanceBulkResponse(
+        success=counts["failed"] == 0,
+        message=f"Processed {len(results)} attendance records",
+        data=results,
+        **counts
+    )
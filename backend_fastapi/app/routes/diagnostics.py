@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Depends, Request
+
+from ..config.database import get_database
+from ..config.monitoring import pool_metrics
+from ..config.settings import settings
+from ..services.cache import employee_cache
+from ..services.coalesce import single_flight
+from ..services.diagnostics import DiagnosticsService
+from ..services.rollups import RollupService
+from ..services.purge import purge_queue
+from ..services.live import live_feed
+from ..services.idempotency import idempotency_store
+from ..middleware.metrics import InstrumentedRoute
+from ..middleware.admission import admission_controller
+
+router = APIRouter(prefix="/api/diagnostics", tags=["Diagnostics"], route_class=InstrumentedRoute)
+
+
+def get_diagnostics_service():
+    """Dependency to get diagnostics service."""
+    db = get_database()
+    return DiagnosticsService(db)
+
+
+@router.get("/queries", response_model=dict)
+async def get_query_diagnostics(
+    service: DiagnosticsService = Depends(get_diagnostics_service)
+):
+    """Explain the service layer's queries and report any slow scans."""
+    reports = await service.explain_queries()
+    slow_scans = [report for report in reports if report["slow_scan"]]
+    return {
+        "success": True,
+        "data": {
+            "indexes": await service.list_indexes(),
+            "slow_scans": slow_scans,
+            "queries": reports,
+        }
+    }
+
+
+@router.get("/pool", response_model=dict)
+async def get_pool_diagnostics():
+    """Report connection pool settings and checkout wait metrics."""
+    return {
+        "success": True,
+        "data": {
+            "config": {
+                "max_pool_size": settings.mongodb_max_pool_size,
+                "min_pool_size": settings.mongodb_min_pool_size,
+                "wait_queue_timeout_ms": settings.mongodb_wait_queue_timeout_ms,
+            },
+            "metrics": pool_metrics.snapshot(),
+        }
+    }
+
+
+@router.get("/cache", response_model=dict)
+async def get_cache_diagnostics(request: Request):
+    """Report employee cache, request coalescing and invalidation counters."""
+    bus = getattr(request.app.state, "invalidation_bus", None)
+    return {
+        "success": True,
+        "data": {
+            "employee_cache": employee_cache.stats(),
+            "request_coalescing": single_flight.stats(),
+            "invalidation_bus": bus.stats() if bus else None,
+        }
+    }
+
+
+@router.get("/admission", response_model=dict)
+async def get_admission_diagnostics():
+    """Report per-class admission limits, queue depth and shed requests."""
+    return {
+        "success": True,
+        "data": admission_controller.stats(),
+    }
+
+
+@router.get("/purge", response_model=dict)
+async def get_purge_diagnostics():
+    """Report the background attendance purge queue."""
+    return {
+        "success": True,
+        "data": purge_queue.stats(),
+    }
+
+
+@router.get("/idempotency", response_model=dict)
+async def get_idempotency_diagnostics():
+    """Report Idempotency-Key replays and the in-memory front cache."""
+    return {
+        "success": True,
+        "data": idempotency_store.stats(),
+    }
+
+
+@router.get("/live", response_model=dict)
+async def get_live_feed_diagnostics():
+    """Report live feed subscribers and event counters."""
+    return {
+        "success": True,
+        "data": live_feed.stats(),
+    }
+
+
+@router.get("/rollups", response_model=dict)
+async def get_rollup_diagnostics():
+    """Compare attendance rollups with raw attendance and report drift."""
+    drift = await RollupService(get_database()).find_drift()
+    return {
+        "success": True,
+        "data": {
+            "drifted_employees": len(drift),
+            "drift": drift,
+        }
+    }
@@ -1,17 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from typing import List, Optional
 
 from ..config.database import get_database
+from ..config.settings import settings
 from ..models.employee import (
     EmployeeCreate,
     EmployeeResponse,
     EmployeeListResponse,
     EmployeeInDB,
+    EmployeeImportResponse,
 )
 from ..services.employee import EmployeeService
 from ..services.attendance import AttendanceService
+from ..services.purge import PurgeService, purge_queue
+from ..services.cache import collection_versions
+from ..services.live import live_feed
+from ..utils.responses import fast_response
+from ..utils.csv_stream import iter_csv_records
+from ..utils.etag import make_etag, etag_matches, not_modified, with_etag
+from ..middleware.metrics import InstrumentedRoute
 
-router = APIRouter(prefix="/api/employees", tags=["Employees"])
+router = APIRouter(prefix="/api/employees", tags=["Employees"], route_class=InstrumentedRoute)
 
 
 def get_employee_service():
@@ -26,31 +35,57 @@ def get_attendance_service():
     return AttendanceService(db)
 
 
+def get_purge_service():
+    """Dependency to get purge service."""
+    db = get_database()
+    return PurgeService(db)
+
+
 @router.get("", response_model=EmployeeListResponse)
 async def get_all_employees(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size, description="Page size"),
     service: EmployeeService = Depends(get_employee_service)
 ):
-    """Get all employees."""
-    employees = await service.get_all()
-    return EmployeeListResponse(
+    """Get a page of employees."""
+    etag = make_etag("employees", collection_versions.get("employees"), cursor, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    employees, next_cursor = await service.get_all(cursor, limit)
+    result = EmployeeListResponse.model_construct(
         success=True,
         count=len(employees),
+        limit=limit,
+        next_cursor=next_cursor,
         data=employees
     )
+    if settings.fast_serialization:
+        result = fast_response(result)
+    return with_etag(result, response, etag)
 
 
 @router.get("/{employee_id}", response_model=EmployeeResponse)
 async def get_employee(
     employee_id: str,
+    request: Request,
+    response: Response,
     service: EmployeeService = Depends(get_employee_service)
 ):
     """Get a single employee by ID."""
+    etag = make_etag("employee", employee_id, collection_versions.get("employees"))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     employee = await service.get_by_id(employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Employee not found"
         )
+    response.headers["ETag"] = etag
     return EmployeeResponse(
         success=True,
         data=employee
@@ -64,6 +99,11 @@ async def create_employee(
 ):
     """Create a new employee."""
     employee = await service.create(employee_data)
+    live_feed.notify("employee_created", {
+        "_id": employee.id,
+        "employee_id": employee.employee_id,
+        "department": employee.department,
+    })
     return EmployeeResponse(
         success=True,
         message="Employee created successfully",
@@ -71,13 +111,49 @@ async def create_employee(
     )
 
 
+@router.post("/import", response_model=EmployeeImportResponse)
+async def import_employees(
+    request: Request,
+    service: EmployeeService = Depends(get_employee_service)
+):
+    """Import employees from a CSV request body.
+    
+    Send the file as the raw body (e.g. `curl --data-binary @employees.csv
+    -H "Content-Type: text/csv"`). The header must contain employee_id,
+    full_name, email and department. Valid rows are imported; every other
+    row is reported with its row number and errors.
+    """
+    rows = iter_csv_records(request.stream(), list(EmployeeCreate.model_fields))
+    total, imported, errors = await service.import_rows(rows)
+    errors.sort(key=lambda error: error.row)
+    if imported:
+        live_feed.refresh()
+    
+    result = EmployeeImportResponse(
+        success=not errors,
+        message=f"Imported {imported} of {total} employees",
+        total_rows=total,
+        imported=imported,
+        failed=len(errors),
+        errors=errors
+    )
+    if settings.fast_serialization:
+        return fast_response(result)
+    return result
+
+
 @router.delete("/{employee_id}", response_model=dict)
 async def delete_employee(
     employee_id: str,
     employee_service: EmployeeService = Depends(get_employee_service),
-    attendance_service: AttendanceService = Depends(get_attendance_service)
+    attendance_service: AttendanceService = Depends(get_attendance_service),
+    purge_service: PurgeService = Depends(get_purge_service)
 ):
-    """Delete an employee and their attendance records."""
+    """Delete an employee and their attendance records.
+    
+    How attendance history is removed depends on EMPLOYEE_DELETE_MODE; in
+    tombstone mode it is purged in the background after this returns.
+    """
     # Check if employee exists
     employee = await employee_service.get_by_id(employee_id)
     if not employee:
@@ -86,11 +162,25 @@ async def delete_employee(
             detail="Employee not found"
         )
     
-    # Delete attendance records first
-    await attendance_service.delete_by_employee(employee_id)
-    
-    # Delete employee
-    deleted = await employee_service.delete(employee_id)
+    mode = settings.employee_delete_mode
+    purge_pending = False
+    if mode == "tombstone":
+        deleted = await purge_service.tombstone(employee_id)
+        purge_pending = purge_queue.enqueue(employee_id)
+        if purge_pending:
+            message = "Employee deleted; attendance records are being purged"
+        else:
+            # No background worker to hand the purge to; finish it inline
+            await purge_service.purge(employee_id)
+            message = "Employee and associated attendance records deleted successfully"
+    elif mode == "transaction":
+        deleted = await purge_service.delete_in_transaction(employee_id)
+        message = "Employee and associated attendance records deleted successfully"
+    else:
+        # Delete attendance records first
+        await attendance_service.delete_by_employee(employee_id)
+        deleted = await employee_service.delete(employee_id)
+        message = "Employee and associated attendance records deleted successfully"
     
     if not deleted:
         raise HTTPException(
@@ -98,8 +188,13 @@ async def delete_employee(
             detail="Failed to delete employee"
         )
     
+    live_feed.notify("employee_deleted", {
+        "_id": employee_id,
+        "employee_id": employee.employee_id,
+        "department": employee.department,
+    })
     return {
         "success": True,
-        "message": "Employee and associated attendance records deleted successfully",
-        "data": {}
+        "message": message,
+        "data": {"attendance_purge": "pending" if purge_pending else "done"}
     }
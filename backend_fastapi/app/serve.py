@@ -0,0 +1,73 @@
+"""
+Production entry point: run the API under uvicorn with several worker processes.
+
+Each worker runs the app lifespan on its own (MongoDB pool, index check,
+purge queue, invalidation bus). Startup failures abort the worker, and on
+SIGTERM/SIGINT workers stop accepting connections, close live feed
+streams, and get up to GRACEFUL_SHUTDOWN_TIMEOUT seconds to finish
+in-flight requests.
+
+Run from backend_fastapi/:
+    python -m app.serve --workers 4
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+import uvicorn
+from uvicorn.main import STARTUP_FAILURE
+from uvicorn.supervisors import Multiprocess
+
+from .config.settings import settings
+from .services.live import live_feed
+
+
+class GracefulServer(uvicorn.Server):
+    """uvicorn server that ends live feed streams as soon as shutdown is signalled.
+    
+    uvicorn waits for in-flight responses before running the lifespan
+    shutdown, and SSE streams never finish on their own, so without this
+    every open dashboard would hold the worker for the full graceful
+    shutdown timeout.
+    """
+    
+    def handle_exit(self, sig, frame) -> None:
+        asyncio.get_running_loop().call_soon_threadsafe(live_feed.close)
+        super().handle_exit(sig, frame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=settings.host)
+    parser.add_argument("--port", type=int, default=settings.port)
+    parser.add_argument("--workers", type=int, default=settings.workers)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+    
+    # Workers read settings from the environment, so pick the bus there
+    if args.workers > 1 and settings.invalidation_bus == "local":
+        os.environ["INVALIDATION_BUS"] = "capped"
+        print("🔁 Multiple workers: using the capped-collection invalidation bus")
+    
+    config = uvicorn.Config(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        lifespan="on",
+        proxy_headers=True,
+        timeout_graceful_shutdown=settings.graceful_shutdown_timeout,
+        log_level=args.log_level,
+    )
+    server = GracefulServer(config)
+    if config.workers > 1:
+        Multiprocess(config, target=server.run, sockets=[config.bind_socket()]).run()
+    else:
+        server.run()
+        if not server.started:
+            sys.exit(STARTUP_FAILURE)
+
+
+if __name__ == "__main__":
+    main()
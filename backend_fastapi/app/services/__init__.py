@@ -1,2 +1,4 @@
 from .employee import EmployeeService
 from .attendance import AttendanceService
+from .diagnostics import DiagnosticsService
+from .purge import PurgeService
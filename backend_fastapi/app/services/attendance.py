@@ -1,42 +1,193 @@
-from typing import List, Optional
+import asyncio
+import calendar
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime, date, timedelta
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
 from fastapi import HTTPException, status
 
 from ..models.attendance import (
     AttendanceCreate,
+    AttendanceBulkItemResult,
     AttendanceInDB,
+    AttendanceMatrixData,
     EmployeeInfo,
     AttendanceSummaryData,
 )
+from ..config.settings import settings
+from ..utils.pagination import encode_cursor, decode_cursor, keyset_query
+from .cache import employee_cache, record_write
+from .coalesce import coalesced
+from .rollups import RollupService
+from .buckets import AttendanceBucketStore, record_id
+
+
+# Record fields selectable with `fields=`, mapped to the stored fields they need
+PROJECTABLE_FIELDS = {
+    "date": "date",
+    "status": "status",
+    "employee": "employee_id",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+
+# One-character codes used by the attendance matrix
+MATRIX_CODES = {"Present": "P", "Absent": "A"}
+MATRIX_NOT_MARKED = "-"
+
+# Column order for attendance exports
+EXPORT_FIELDS = [
+    "id",
+    "date",
+    "status",
+    "employee_ref",
+    "employee_id",
+    "full_name",
+    "email",
+    "department",
+    "created_at",
+    "updated_at",
+]
 
 
 class AttendanceService:
-    """Service class for attendance operations."""
+    """Service class for attendance operations.
+    
+    Records live in `attendance` (one document per employee per day) or,
+    with ATTENDANCE_STORAGE=bucketed, in per-employee-per-month buckets;
+    every public method behaves the same on either schema.
+    """
     
-    def __init__(self, database: AsyncIOMotorDatabase):
+    def __init__(self, database: AsyncIOMotorDatabase, storage: Optional[str] = None):
         self.database = database
         self.collection = database["attendance"]
         self.employees_collection = database["employees"]
+        self.tombstones_collection = database["employee_tombstones"]
+        storage = storage or settings.attendance_storage
+        self.buckets = AttendanceBucketStore(database) if storage == "bucketed" else None
+        self.rollups = RollupService(database, storage)
+        self.read_scope = (self.collection.full_name, storage)
     
-    async def _populate_employee(self, attendance_doc: dict) -> dict:
-        """Populate employee info in attendance document."""
-        if "employee_id" in attendance_doc:
-            employee = await self.employees_collection.find_one({
-                "_id": ObjectId(attendance_doc["employee_id"])
-            })
+    async def _load_employees(self, employee_ids: List[str]) -> Dict[str, dict]:
+        """Load employee documents by id with a single query."""
+        employees = {}
+        cursor = self.employees_collection.find({
+            "_id": {"$in": [ObjectId(eid) for eid in employee_ids]}
+        })
+        async for employee in cursor:
+            employee["_id"] = str(employee["_id"])
+            employees[employee["_id"]] = employee
+        return employees
+    
+    async def _get_employee(self, employee_id: str) -> dict:
+        """Get an employee through the cache, raising 404 if it does not exist."""
+        employee = await employee_cache.get(employee_id, self._load_employees)
+        if not employee:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Employee not found"
+            )
+        return employee
+    
+    async def _populate_employees(self, attendance_docs: List[dict]) -> List[dict]:
+        """Populate employee info for many attendance documents from the cache."""
+        employee_ids = {
+            doc["employee_id"]
+            for doc in attendance_docs
+            if ObjectId.is_valid(doc.get("employee_id", ""))
+        }
+        if not employee_ids:
+            return attendance_docs
+        
+        cached = await employee_cache.get_many(employee_ids, self._load_employees)
+        # Documents come from our own collection, so skip revalidation in fast mode
+        build = EmployeeInfo.model_construct if settings.fast_serialization else EmployeeInfo
+        employees = {
+            employee_id: build(**employee)
+            for employee_id, employee in cached.items()
+        }
+        
+        for doc in attendance_docs:
+            employee = employees.get(doc.get("employee_id"))
             if employee:
-                employee["_id"] = str(employee["_id"])
-                attendance_doc["employee"] = EmployeeInfo(**employee)
-        return attendance_doc
+                doc["employee"] = employee
+        return attendance_docs
     
-    async def get_all(
+    def _projection(self, fields: Optional[List[str]]) -> Optional[dict]:
+        """Build a Mongo projection for the requested record fields."""
+        if not fields:
+            return None
+        
+        unknown = [field for field in fields if field not in PROJECTABLE_FIELDS and field not in ("id", "_id")]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(PROJECTABLE_FIELDS)}"
+            )
+        
+        # date is always returned since records are ordered and paged by it
+        projection = {"_id": 1, "date": 1}
+        for field in fields:
+            if field in PROJECTABLE_FIELDS:
+                projection[PROJECTABLE_FIELDS[field]] = 1
+        return projection
+    
+    async def _fetch_records(
+        self,
+        query: dict,
+        limit: Optional[int] = None,
+        projection: Optional[dict] = None,
+    ) -> List[AttendanceInDB]:
+        """Run an attendance query and return populated records."""
+        docs = []
+        cursor = self.collection.find(query, projection).sort([("date", -1), ("_id", -1)])
+        if limit:
+            cursor = cursor.limit(limit)
+        
+        async for doc in cursor:
+            docs.append(doc)
+        return await self._build_records(docs, projection)
+    
+    async def _build_records(
+        self,
+        docs: List[dict],
+        projection: Optional[dict] = None,
+    ) -> List[AttendanceInDB]:
+        """Populate raw attendance documents and build response records."""
+        for doc in docs:
+            doc["_id"] = str(doc["_id"])
+            doc["date"] = doc["date"].date() if isinstance(doc["date"], datetime) else doc["date"]
+        
+        # Skip the employee lookup entirely when the caller didn't ask for it
+        if projection is None or "employee_id" in projection:
+            docs = await self._populate_employees(docs)
+        build = AttendanceInDB.model_construct if settings.fast_serialization else AttendanceInDB
+        return [build(**doc) for doc in docs]
+    
+    async def _fetch_page(
+        self,
+        query: dict,
+        limit: int,
+        projection: Optional[dict] = None,
+    ) -> Tuple[List[AttendanceInDB], Optional[str]]:
+        """Fetch one page of records and the cursor for the next page."""
+        records = await self._fetch_records(query, limit + 1, projection)
+        if len(records) <= limit:
+            return records, None
+        
+        records = records[:limit]
+        last = records[-1]
+        next_cursor = encode_cursor(datetime.combine(last.date, datetime.min.time()), last.id)
+        return records, next_cursor
+    
+    def _date_query(
         self,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-    ) -> List[AttendanceInDB]:
-        """Get all attendance records with optional date filtering."""
+    ) -> dict:
+        """Build the date range filter for attendance queries."""
         query = {}
         
         if start_date and end_date:
@@ -49,22 +200,106 @@ class AttendanceService:
         elif end_date:
             query["date"] = {"$lte": datetime.combine(end_date, datetime.max.time())}
         
-        records = []
-        cursor = self.collection.find(query).sort("date", -1)
+        return query
+    
+    @coalesced("attendance", "employees")
+    async def get_all(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        cursor: Optional[str] = None,
+        limit: int = settings.default_page_size,
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[List[AttendanceInDB], Optional[str]]:
+        """Get a page of attendance records with optional date filtering."""
+        if self.buckets:
+            return await self._get_bucketed_page(start_date, end_date, cursor, limit, fields)
+        query = keyset_query(self._date_query(start_date, end_date), "date", cursor)
+        return await self._fetch_page(query, limit, self._projection(fields))
+    
+    async def _get_bucketed_page(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        cursor: Optional[str],
+        limit: int,
+        fields: Optional[List[str]],
+    ) -> Tuple[List[AttendanceInDB], Optional[str]]:
+        """Bucketed get_all; the cursor holds the last (date, employee_id) position."""
+        projection = self._projection(fields)
+        after = None
+        if cursor:
+            cursor_date, cursor_employee = decode_cursor(cursor)
+            after = (cursor_date.date(), str(cursor_employee))
         
-        async for doc in cursor:
+        docs = await self.buckets.find(start_date, end_date, after=after, limit=limit + 1)
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor(docs[-1]["date"], docs[-1]["employee_id"])
+        if projection:
+            docs = [{key: value for key, value in doc.items() if key in projection} for doc in docs]
+        return await self._build_records(docs, projection), next_cursor
+    
+    async def _export_rows(self, attendance_docs: List[dict]) -> List[dict]:
+        """Flatten a batch of attendance documents into export rows."""
+        for doc in attendance_docs:
             doc["_id"] = str(doc["_id"])
-            doc["date"] = doc["date"].date() if isinstance(doc["date"], datetime) else doc["date"]
-            doc = await self._populate_employee(doc)
-            records.append(AttendanceInDB(**doc))
+        attendance_docs = await self._populate_employees(attendance_docs)
         
-        return records
+        rows = []
+        for doc in attendance_docs:
+            employee = doc.get("employee")
+            attendance_date = doc["date"]
+            rows.append({
+                "id": doc["_id"],
+                "date": (attendance_date.date() if isinstance(attendance_date, datetime) else attendance_date).isoformat(),
+                "status": doc["status"],
+                "employee_ref": doc.get("employee_id"),
+                "employee_id": employee.employee_id if employee else None,
+                "full_name": employee.full_name if employee else None,
+                "email": employee.email if employee else None,
+                "department": employee.department if employee else None,
+                "created_at": doc["created_at"].isoformat() if doc.get("created_at") else None,
+                "updated_at": doc["updated_at"].isoformat() if doc.get("updated_at") else None,
+            })
+        return rows
+    
+    async def iter_export_rows(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        batch_size: int = settings.export_batch_size,
+    ) -> AsyncIterator[List[dict]]:
+        """Stream attendance records as flat rows, one batch at a time."""
+        if self.buckets:
+            async for batch in self.buckets.iter_batches(start_date, end_date, batch_size):
+                yield await self._export_rows(batch)
+            return
+        
+        cursor = (
+            self.collection.find(self._date_query(start_date, end_date))
+            .sort([("date", -1), ("_id", -1)])
+            .batch_size(batch_size)
+        )
+        
+        batch = []
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                yield await self._export_rows(batch)
+                batch = []
+        
+        if batch:
+            yield await self._export_rows(batch)
     
+    @coalesced("attendance", "employees")
     async def get_by_employee(
         self,
         employee_id: str,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
+        fields: Optional[List[str]] = None,
     ) -> List[AttendanceInDB]:
         """Get attendance records for a specific employee."""
         if not ObjectId.is_valid(employee_id):
@@ -74,89 +309,182 @@ class AttendanceService:
             )
         
         # Check if employee exists
-        employee = await self.employees_collection.find_one({"_id": ObjectId(employee_id)})
-        if not employee:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Employee not found"
-            )
+        employee = await self._get_employee(employee_id)
         
-        query = {"employee_id": employee_id}
+        projection = self._projection(fields)
+        if self.buckets:
+            docs = await self.buckets.find(start_date, end_date, employee_id=employee_id)
+            if projection:
+                docs = [{key: value for key, value in doc.items() if key in projection} for doc in docs]
+            return await self._build_records(docs, projection)
         
-        if start_date and end_date:
-            query["date"] = {
-                "$gte": datetime.combine(start_date, datetime.min.time()),
-                "$lte": datetime.combine(end_date, datetime.max.time()),
-            }
+        query = {"employee_id": employee_id, **self._date_query(start_date, end_date)}
+        return await self._fetch_records(query, projection=projection)
+    
+    async def mark_attendance(self, attendance_data: AttendanceCreate) -> AttendanceInDB:
+        """Mark or update attendance for an employee."""
+        # Check if employee exists; the same document populates the response
+        employee = await self._get_employee(attendance_data.employee_id)
+        if self.buckets:
+            return await self._mark_bucketed(attendance_data, employee)
         
-        records = []
-        cursor = self.collection.find(query).sort("date", -1)
+        previous, new_id, now = await self._upsert(
+            attendance_data.employee_id, attendance_data.date, attendance_data.status
+        )
+        previous_status = previous["status"] if previous else None
+        await self.rollups.apply([
+            (attendance_data.employee_id, attendance_data.date, previous_status, attendance_data.status)
+        ])
+        record_write("attendance")
         
-        async for doc in cursor:
-            doc["_id"] = str(doc["_id"])
-            doc["date"] = doc["date"].date() if isinstance(doc["date"], datetime) else doc["date"]
-            doc = await self._populate_employee(doc)
-            records.append(AttendanceInDB(**doc))
+        attendance_doc = {
+            **(previous or {"_id": new_id, "created_at": now}),
+            "status": attendance_data.status,
+            "updated_at": now,
+        }
+        attendance_doc["_id"] = str(attendance_doc["_id"])
+        attendance_doc["date"] = attendance_data.date
+        attendance_doc["employee"] = EmployeeInfo(**employee)
         
-        return records
+        return AttendanceInDB(**attendance_doc)
     
-    async def mark_attendance(self, attendance_data: AttendanceCreate) -> AttendanceInDB:
-        """Mark or update attendance for an employee."""
-        # Check if employee exists
-        employee = await self.employees_collection.find_one({
-            "_id": ObjectId(attendance_data.employee_id)
-        })
-        if not employee:
+    async def _upsert(
+        self,
+        employee_id: str,
+        attendance_date: date,
+        new_status: str,
+    ) -> Tuple[Optional[dict], ObjectId, datetime]:
+        """Set one daily record's status; returns its previous version, the id it gets if new, and the write time."""
+        now = datetime.utcnow()
+        query = {
+            "employee_id": employee_id,
+            # Convert date to datetime for MongoDB
+            "date": datetime.combine(attendance_date, datetime.min.time()),
+        }
+        new_id = ObjectId()
+        update = {
+            "$set": {
+                "status": new_status,
+                "updated_at": now,
+            },
+            "$setOnInsert": {"_id": new_id, "created_at": now},
+        }
+        
+        # Upsert in one round trip so concurrent marks cannot create duplicates.
+        # The previous version is returned so the rollups can see a status flip.
+        try:
+            previous = await self.collection.find_one_and_update(
+                query, update, upsert=True, return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            # A concurrent upsert inserted the record first; update it instead
+            previous = await self.collection.find_one_and_update(
+                query, update, return_document=ReturnDocument.BEFORE
+            )
+        return previous, new_id, now
+    
+    async def _mark_bucketed(self, attendance_data: AttendanceCreate, employee: dict) -> AttendanceInDB:
+        """Bucketed mark_attendance: one positional $set on the month's bucket."""
+        previous_status, created_at = await self.buckets.mark(
+            attendance_data.employee_id, attendance_data.date, attendance_data.status
+        )
+        await self.rollups.apply([
+            (attendance_data.employee_id, attendance_data.date, previous_status, attendance_data.status)
+        ])
+        record_write("attendance")
+        
+        return AttendanceInDB(
+            _id=record_id(attendance_data.employee_id, attendance_data.date),
+            employee_id=attendance_data.employee_id,
+            date=attendance_data.date,
+            status=attendance_data.status,
+            employee=EmployeeInfo(**employee),
+            created_at=created_at,
+            updated_at=datetime.utcnow(),
+        )
+    
+    async def mark_attendance_bulk(
+        self,
+        records: List[AttendanceCreate],
+    ) -> List[AttendanceBulkItemResult]:
+        """Mark attendance for many employees with one employee lookup.
+        
+        Each record is upserted on its own, up to `bulk_write_concurrency` at
+        a time, so its previous status comes from the write itself and
+        concurrent bulk requests cannot count the same record twice in the
+        rollups.
+        """
+        if len(records) > settings.max_bulk_size:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Employee not found"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Bulk requests are limited to {settings.max_bulk_size} records"
             )
         
-        # Convert date to datetime for MongoDB
-        attendance_date = datetime.combine(attendance_data.date, datetime.min.time())
+        # Check all employees exist with at most one query
+        requested_ids = {record.employee_id for record in records}
+        existing_ids = set(await employee_cache.get_many(requested_ids, self._load_employees))
         
-        # Check for existing attendance on the same date
-        existing = await self.collection.find_one({
-            "employee_id": attendance_data.employee_id,
-            "date": attendance_date,
-        })
+        # The last entry for an employee and date wins
+        last_index = {}
+        for index, record in enumerate(records):
+            last_index[(record.employee_id, record.date)] = index
         
-        now = datetime.utcnow()
+        results = []
+        operation_items = []
         
-        if existing:
-            # Update existing attendance
-            await self.collection.update_one(
-                {"_id": existing["_id"]},
-                {
-                    "$set": {
-                        "status": attendance_data.status,
-                        "updated_at": now,
-                    }
-                }
+        for index, record in enumerate(records):
+            result = AttendanceBulkItemResult(
+                index=index,
+                employee_id=record.employee_id,
+                date=record.date,
+                status=record.status,
+                result="updated",
             )
-            existing["_id"] = str(existing["_id"])
-            existing["status"] = attendance_data.status
-            existing["updated_at"] = now
-            existing["date"] = attendance_data.date
-            existing = await self._populate_employee(existing)
-            return AttendanceInDB(**existing)
-        
-        # Create new attendance record
-        attendance_doc = {
-            "employee_id": attendance_data.employee_id,
-            "date": attendance_date,
-            "status": attendance_data.status,
-            "created_at": now,
-            "updated_at": now,
-        }
+            results.append(result)
+            
+            if record.employee_id not in existing_ids:
+                result.result = "failed"
+                result.message = "Employee not found"
+                continue
+            if last_index[(record.employee_id, record.date)] != index:
+                result.result = "skipped"
+                result.message = "Superseded by a later entry for the same employee and date"
+                continue
+            
+            operation_items.append(result)
         
-        result = await self.collection.insert_one(attendance_doc)
-        attendance_doc["_id"] = str(result.inserted_id)
-        attendance_doc["date"] = attendance_data.date
-        attendance_doc = await self._populate_employee(attendance_doc)
+        if not operation_items:
+            return results
         
-        return AttendanceInDB(**attendance_doc)
+        semaphore = asyncio.Semaphore(settings.bulk_write_concurrency)
+        
+        async def write(item: AttendanceBulkItemResult) -> Optional[Tuple[str, date, Optional[str], str]]:
+            async with semaphore:
+                try:
+                    if self.buckets:
+                        previous_status, _ = await self.buckets.mark(item.employee_id, item.date, item.status)
+                        item.id = record_id(item.employee_id, item.date)
+                    else:
+                        previous, new_id, _ = await self._upsert(item.employee_id, item.date, item.status)
+                        previous_status = previous["status"] if previous else None
+                        item.id = str(previous["_id"] if previous else new_id)
+                except PyMongoError as exc:
+                    item.result = "failed"
+                    item.message = str(exc) or "Write failed"
+                    return None
+            item.result = "updated" if previous_status else "created"
+            return item.employee_id, item.date, previous_status, item.status
+        
+        try:
+            changes = await asyncio.gather(*(write(item) for item in operation_items))
+        finally:
+            record_write("attendance")
+        
+        await self.rollups.apply(change for change in changes if change)
+        
+        return results
     
+    @coalesced("attendance", "employees")
     async def get_employee_summary(self, employee_id: str) -> dict:
         """Get attendance summary for an employee."""
         if not ObjectId.is_valid(employee_id):
@@ -166,26 +494,20 @@ class AttendanceService:
             )
         
         # Check if employee exists
-        employee = await self.employees_collection.find_one({"_id": ObjectId(employee_id)})
-        if not employee:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Employee not found"
-            )
-        
-        # Aggregate attendance stats
-        pipeline = [
-            {"$match": {"employee_id": employee_id}},
-            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
-        ]
+        employee, rollup = await asyncio.gather(
+            self._get_employee(employee_id),
+            self.rollups.get_totals(employee_id),
+        )
+        if not (rollup and rollup.get("seeded")):
+            # Rollups only cover marks made since they were introduced
+            rollup = await self.rollups.seed(employee_id)
         
-        summary = AttendanceSummaryData()
-        async for doc in self.collection.aggregate(pipeline):
-            if doc["_id"] == "Present":
-                summary.present_days = doc["count"]
-            elif doc["_id"] == "Absent":
-                summary.absent_days = doc["count"]
-            summary.total_days += doc["count"]
+        summary = AttendanceSummaryData(
+            present_days=rollup.get("present", 0),
+            absent_days=rollup.get("absent", 0),
+            total_days=rollup.get("total", 0),
+        )
+        months = await self.rollups.get_months(employee_id)
         
         return {
             "employee": {
@@ -194,38 +516,123 @@ class AttendanceService:
                 "full_name": employee["full_name"],
             },
             "summary": summary.model_dump(),
+            "months": months,
         }
     
-    async def get_today_stats(self) -> dict:
-        """Get today's attendance statistics."""
-        today = datetime.combine(date.today(), datetime.min.time())
-        tomorrow = today + timedelta(days=1)
+    @coalesced("attendance", "employees")
+    async def get_month_matrix(self, month: str, department: Optional[str] = None) -> AttendanceMatrixData:
+        """Build the employee x day status grid for a month (YYYY-MM)."""
+        year, month_number = (int(part) for part in month.split("-"))
+        days = calendar.monthrange(year, month_number)[1]
+        start = datetime(year, month_number, 1)
+        end = start + timedelta(days=days)
         
-        # Get today's attendance records
-        cursor = self.collection.find({
-            "date": {"$gte": today, "$lt": tomorrow}
-        })
+        employee_filter = {"department": department} if department else {}
+        employees_cursor = self.employees_collection.find(
+            employee_filter, {"employee_id": 1, "full_name": 1}
+        ).sort("employee_id", 1)
         
-        present = 0
-        absent = 0
+        match = {"date": {"$gte": start, "$lt": end}}
+        employees = []
+        if department:
+            # Narrow the attendance scan to the department's employees
+            async for employee in employees_cursor:
+                employees.append(employee)
+            match["employee_id"] = {"$in": [str(employee["_id"]) for employee in employees]}
         
-        async for doc in cursor:
-            if doc["status"] == "Present":
-                present += 1
-            elif doc["status"] == "Absent":
-                absent += 1
+        pipeline = [
+            {"$match": match},
+            {
+                "$group": {
+                    "_id": "$employee_id",
+                    "days": {"$push": {"d": {"$dayOfMonth": "$date"}, "s": "$status"}},
+                }
+            },
+        ]
+        
+        async def load_grid() -> Dict[str, List[dict]]:
+            if self.buckets:
+                return await self.buckets.month_grid(month, match.get("employee_id", {}).get("$in"))
+            return {doc["_id"]: doc["days"] async for doc in self.collection.aggregate(pipeline)}
         
-        # Get total employees
-        total_employees = await self.employees_collection.count_documents({})
+        async def load_employees() -> List[dict]:
+            return [employee async for employee in employees_cursor]
+        
+        if department:
+            grid = await load_grid()
+        else:
+            employees, grid = await asyncio.gather(load_employees(), load_grid())
+        
+        rows = []
+        for employee in employees:
+            employee_id = str(employee["_id"])
+            cells = [MATRIX_NOT_MARKED] * days
+            for entry in grid.get(employee_id, []):
+                cells[entry["d"] - 1] = MATRIX_CODES.get(entry["s"], MATRIX_NOT_MARKED)
+            rows.append([employee_id, employee["employee_id"], employee["full_name"], "".join(cells)])
+        
+        return AttendanceMatrixData(
+            month=month,
+            days=days,
+            legend={code: status for status, code in MATRIX_CODES.items()} | {MATRIX_NOT_MARKED: "Not marked"},
+            columns=["_id", "employee_id", "full_name", "days"],
+            rows=rows,
+        )
+    
+    @coalesced("attendance", "employees")
+    async def get_today_counts(self) -> dict:
+        """Count today's attendance by status on the server.
+        
+        Records of employees deleted in tombstone mode are left out until
+        their purge finishes.
+        """
+        purging = [doc["_id"] async for doc in self.tombstones_collection.find({}, {"_id": 1})]
+        if self.buckets:
+            counts = await self.buckets.day_counts(date.today(), exclude_employee_ids=purging)
+            return {"present": counts.get("Present", 0), "absent": counts.get("Absent", 0)}
+        
+        today = datetime.combine(date.today(), datetime.min.time())
+        tomorrow = today + timedelta(days=1)
+        match = {"date": {"$gte": today, "$lt": tomorrow}}
+        if purging:
+            match["employee_id"] = {"$nin": purging}
+        
+        pipeline = [
+            {"$match": match},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+        ]
+        
+        counts = {"present": 0, "absent": 0}
+        async for doc in self.collection.aggregate(pipeline):
+            if doc["_id"] == "Present":
+                counts["present"] = doc["count"]
+            elif doc["_id"] == "Absent":
+                counts["absent"] = doc["count"]
+        return counts
+    
+    @coalesced("attendance", "employees")
+    async def get_today_stats(self) -> dict:
+        """Get today's attendance statistics."""
+        counts, total_employees = await asyncio.gather(
+            self.get_today_counts(),
+            self.employees_collection.count_documents({}),
+        )
+        present = counts["present"]
+        absent = counts["absent"]
         
         return {
             "date": date.today().isoformat(),
             "present": present,
             "absent": absent,
-            "not_marked": total_employees - present - absent,
+            "not_marked": max(total_employees - present - absent, 0),
         }
     
     async def delete_by_employee(self, employee_id: str) -> int:
-        """Delete all attendance records for an employee."""
-        result = await self.collection.delete_many({"employee_id": employee_id})
-        return result.deleted_count
+        """Delete all attendance records (or buckets) for an employee."""
+        if self.buckets:
+            deleted = await self.buckets.delete_by_employee(employee_id)
+        else:
+            deleted = (await self.collection.delete_many({"employee_id": employee_id})).deleted_count
+        await self.rollups.delete_by_employee(employee_id)
+        record_write("attendance")
+        return deleted
@@ -0,0 +1,299 @@
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime, date
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+
+# One-character status codes stored in bucket day maps
+STATUS_CODES = {"Present": "P", "Absent": "A"}
+CODE_STATUSES = {code: status for status, code in STATUS_CODES.items()}
+
+# Sort order of records expanded from buckets, newest first
+RECORD_SORT = {"month": -1, "d": -1, "employee_id": -1}
+
+
+def bucket_month(attendance_date: date) -> str:
+    """Bucket month key for a date, e.g. 2024-01."""
+    return attendance_date.strftime("%Y-%m")
+
+
+def record_id(employee_id: str, attendance_date: date) -> str:
+    """Stable id of one day's record inside a bucket."""
+    return f"{employee_id}-{attendance_date.strftime('%Y%m%d')}"
+
+
+def on_or_after(day: date) -> dict:
+    """Match expanded records dated on or after a day."""
+    return {"$or": [
+        {"month": {"$gt": bucket_month(day)}},
+        {"month": bucket_month(day), "d": {"$gte": day.day}},
+    ]}
+
+
+def on_or_before(day: date) -> dict:
+    """Match expanded records dated on or before a day."""
+    return {"$or": [
+        {"month": {"$lt": bucket_month(day)}},
+        {"month": bucket_month(day), "d": {"$lte": day.day}},
+    ]}
+
+
+def before_position(day: date, employee_id: str) -> dict:
+    """Match expanded records after a (date, employee_id) position in RECORD_SORT order."""
+    month = bucket_month(day)
+    return {"$or": [
+        {"month": {"$lt": month}},
+        {"month": month, "d": {"$lt": day.day}},
+        {"month": month, "d": day.day, "employee_id": {"$lt": employee_id}},
+    ]}
+
+
+def expand_stages() -> List[dict]:
+    """Stages turning buckets into one {employee_id, month, d, code} doc per marked day."""
+    return [
+        {"$project": {
+            "employee_id": 1,
+            "month": 1,
+            "created_at": 1,
+            "updated_at": 1,
+            "day": {"$objectToArray": "$days"},
+        }},
+        {"$unwind": "$day"},
+        {"$project": {
+            "_id": 0,
+            "employee_id": 1,
+            "month": 1,
+            "created_at": 1,
+            "updated_at": 1,
+            "code": "$day.v",
+            "d": {"$toInt": "$day.k"},
+        }},
+    ]
+
+
+class AttendanceBucketStore:
+    """Attendance stored as one bucket document per employee per month.
+    
+    A bucket holds a `days` map from day of month to a one-character status
+    code, so a month of attendance is a single small document. Marks update
+    it in place with `$set` on `days.<day>`. Timestamps are kept per bucket.
+    Records read back are shaped like the daily schema, with a synthetic
+    `<employee_id>-<YYYYMMDD>` id.
+    """
+    
+    def __init__(self, database: AsyncIOMotorDatabase):
+        self.collection = database["attendance_buckets"]
+    
+    def _record(self, doc: dict) -> dict:
+        """Daily-schema record for an expanded bucket day."""
+        year, month = (int(part) for part in doc["month"].split("-"))
+        attendance_date = datetime(year, month, doc["d"])
+        return {
+            "_id": record_id(doc["employee_id"], attendance_date),
+            "employee_id": doc["employee_id"],
+            "date": attendance_date,
+            "status": CODE_STATUSES.get(doc["code"], doc["code"]),
+            "created_at": doc.get("created_at"),
+            "updated_at": doc.get("updated_at"),
+        }
+    
+    async def mark(self, employee_id: str, attendance_date: date, status: str) -> Tuple[Optional[str], datetime]:
+        """Set one day's status; returns the previous status and the bucket's created_at."""
+        now = datetime.utcnow()
+        day = str(attendance_date.day)
+        query = {"employee_id": employee_id, "month": bucket_month(attendance_date)}
+        update = {
+            "$set": {f"days.{day}": STATUS_CODES[status], "updated_at": now},
+            "$setOnInsert": {"created_at": now},
+        }
+        projection = {f"days.{day}": 1, "created_at": 1}
+        try:
+            previous = await self.collection.find_one_and_update(
+                query, update, projection=projection, upsert=True, return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            # A concurrent upsert created the bucket first; update it instead
+            previous = await self.collection.find_one_and_update(
+                query, update, projection=projection, return_document=ReturnDocument.BEFORE
+            )
+        
+        if not previous:
+            return None, now
+        code = previous.get("days", {}).get(day)
+        return CODE_STATUSES.get(code) if code else None, previous.get("created_at", now)
+    
+    def _match(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        employee_id: Optional[str] = None,
+        after: Optional[Tuple[date, str]] = None,
+    ) -> Tuple[dict, dict]:
+        """Bucket-level and record-level filters for a date range and keyset position."""
+        bucket_match = {}
+        if employee_id:
+            bucket_match["employee_id"] = employee_id
+        months = {}
+        if start_date:
+            months["$gte"] = bucket_month(start_date)
+        upper = min(filter(None, [end_date, after[0] if after else None]), default=None)
+        if upper:
+            months["$lte"] = bucket_month(upper)
+        if months:
+            bucket_match["month"] = months
+        
+        conditions = []
+        if start_date:
+            conditions.append(on_or_after(start_date))
+        if end_date:
+            conditions.append(on_or_before(end_date))
+        if after:
+            conditions.append(before_position(*after))
+        return bucket_match, {"$and": conditions} if conditions else {}
+    
+    async def _months(self, bucket_match: dict) -> List[str]:
+        """Months with at least one bucket matching the filter, newest first."""
+        return sorted(await self.collection.distinct("month", bucket_match), reverse=True)
+    
+    async def _expand(self, bucket_match: dict, record_match: dict, limit: Optional[int] = None) -> AsyncIterator[dict]:
+        pipeline = [{"$match": bucket_match}, *expand_stages()]
+        if record_match:
+            pipeline.append({"$match": record_match})
+        pipeline.append({"$sort": RECORD_SORT})
+        if limit:
+            pipeline.append({"$limit": limit})
+        async for doc in self.collection.aggregate(pipeline):
+            yield self._record(doc)
+    
+    async def find(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        employee_id: Optional[str] = None,
+        after: Optional[Tuple[date, str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """Records in a date range, newest first, after an optional (date, employee_id) position.
+        
+        A single employee's buckets are expanded in one query. Across all
+        employees, months are expanded one at a time, newest first, until
+        the limit is reached, so a page never unwinds the whole history.
+        """
+        bucket_match, record_match = self._match(start_date, end_date, employee_id, after)
+        if employee_id:
+            return [record async for record in self._expand(bucket_match, record_match, limit)]
+        
+        records = []
+        for month in await self._months(bucket_match):
+            remaining = limit - len(records) if limit else None
+            async for record in self._expand({**bucket_match, "month": month}, record_match, remaining):
+                records.append(record)
+            if limit and len(records) >= limit:
+                break
+        return records
+    
+    async def iter_batches(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        batch_size: int = 2000,
+    ) -> AsyncIterator[List[dict]]:
+        """Stream records in a date range, newest first, one batch at a time."""
+        bucket_match, record_match = self._match(start_date, end_date)
+        batch = []
+        for month in await self._months(bucket_match):
+            async for record in self._expand({**bucket_match, "month": month}, record_match):
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+    
+    async def month_grid(self, month: str, employee_ids: Optional[List[str]] = None) -> Dict[str, List[dict]]:
+        """Day/status entries per employee for a month, read straight from the buckets."""
+        query = {"month": month}
+        if employee_ids is not None:
+            query["employee_id"] = {"$in": employee_ids}
+        grid = {}
+        async for doc in self.collection.find(query, {"employee_id": 1, "days": 1}):
+            grid[doc["employee_id"]] = [
+                {"d": int(day), "s": CODE_STATUSES.get(code, code)}
+                for day, code in doc.get("days", {}).items()
+            ]
+        return grid
+    
+    async def day_counts(self, day: date, exclude_employee_ids: Optional[List[str]] = None) -> Dict[str, int]:
+        """Count one day's records by status."""
+        field = f"days.{day.day}"
+        match = {"month": bucket_month(day), field: {"$exists": True}}
+        if exclude_employee_ids:
+            match["employee_id"] = {"$nin": exclude_employee_ids}
+        pipeline = [
+            {"$match": match},
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+        ]
+        return {
+            CODE_STATUSES.get(doc["_id"], doc["_id"]): doc["count"]
+            async for doc in self.collection.aggregate(pipeline)
+        }
+    
+    async def delete_by_employee(self, employee_id: str) -> int:
+        """Delete all buckets for an employee."""
+        result = await self.collection.delete_many({"employee_id": employee_id})
+        return result.deleted_count
+    
+    async def migrate_from(self, daily_collection) -> dict:
+        """Build buckets from daily attendance documents on the server.
+        
+        Days already present in a bucket are kept, so re-running after the
+        switch does not overwrite newer marks.
+        """
+        pipeline = [
+            {"$group": {
+                "_id": {
+                    "employee_id": "$employee_id",
+                    "month": {"$dateToString": {"format": "%Y-%m", "date": "$date"}},
+                },
+                "days": {"$push": {
+                    "k": {"$toString": {"$dayOfMonth": "$date"}},
+                    "v": {"$cond": [{"$eq": ["$status", "Present"]}, "P", "A"]},
+                }},
+                "created_at": {"$min": "$created_at"},
+                "updated_at": {"$max": "$updated_at"},
+            }},
+            {"$project": {
+                "_id": 0,
+                "employee_id": "$_id.employee_id",
+                "month": "$_id.month",
+                "days": {"$arrayToObject": "$days"},
+                "created_at": 1,
+                "updated_at": 1,
+            }},
+            {"$merge": {
+                "into": self.collection.name,
+                "on": ["employee_id", "month"],
+                "whenMatched": [{"$set": {"days": {"$mergeObjects": ["$$new.days", "$days"]}}}],
+                "whenNotMatched": "insert",
+            }},
+        ]
+        async for _ in daily_collection.aggregate(pipeline):
+            pass
+        return await self.verify_against(daily_collection)
+    
+    async def verify_against(self, daily_collection) -> dict:
+        """Compare record counts between the daily collection and the buckets."""
+        daily = await daily_collection.count_documents({})
+        bucketed = 0
+        pipeline = [
+            {"$project": {"days": {"$size": {"$objectToArray": "$days"}}}},
+            {"$group": {"_id": None, "days": {"$sum": "$days"}}},
+        ]
+        async for doc in self.collection.aggregate(pipeline):
+            bucketed = doc["days"]
+        return {
+            "daily_records": daily,
+            "bucketed_records": bucketed,
+            "buckets": await self.collection.count_documents({}),
+        }
@@ -0,0 +1,195 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from ..config.settings import settings
+
+
+class TTLCache:
+    """Small in-process cache whose entries expire after a fixed TTL.
+    
+    Like EmployeeCache, a generation counter keeps a value computed while
+    an invalidation happened from being stored afterwards.
+    """
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.generation = 0
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(key, None)
+            return None
+        return value
+    
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """Store a value; a TTL of zero disables caching.
+        
+        Pass the `generation` read before computing the value; the value is
+        dropped if the cache was invalidated since.
+        """
+        if self.ttl <= 0 or (generation is not None and generation != self.generation):
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+    
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or every entry when no key is given."""
+        self.generation += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+# Assembled dashboard data, dropped on any attendance or employee write
+dashboard_cache = TTLCache(settings.dashboard_cache_ttl)
+
+
+class EmployeeCache:
+    """LRU cache of employee documents keyed by their MongoDB id.
+    
+    Entries expire after a TTL and are dropped by EmployeeService writes.
+    A generation counter keeps a lookup that raced with an invalidation
+    from writing stale documents back into the cache.
+    """
+    
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._generation = 0
+    
+    def _get(self, employee_id: str) -> Optional[dict]:
+        entry = self._entries.get(employee_id)
+        if entry is None:
+            return None
+        expires_at, doc = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[employee_id]
+            return None
+        self._entries.move_to_end(employee_id)
+        return doc
+    
+    def _put(self, employee_id: str, doc: dict) -> None:
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        self._entries[employee_id] = (time.monotonic() + self.ttl, doc)
+        self._entries.move_to_end(employee_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    async def get_many(
+        self,
+        employee_ids: Iterable[str],
+        loader: Callable[[List[str]], Awaitable[Dict[str, dict]]],
+    ) -> Dict[str, dict]:
+        """Return employee docs for the given ids, loading misses in one call.
+        
+        Missing employees are absent from the result. Returned documents are
+        copies, so callers may mutate them freely.
+        """
+        found = {}
+        missing = []
+        for employee_id in set(employee_ids):
+            doc = self._get(employee_id)
+            if doc is None:
+                missing.append(employee_id)
+            else:
+                found[employee_id] = doc
+        
+        self.hits += len(found)
+        self.misses += len(missing)
+        
+        if missing:
+            generation = self._generation
+            loaded = await loader(missing)
+            for employee_id, doc in loaded.items():
+                if generation == self._generation:
+                    self._put(employee_id, doc)
+                found[employee_id] = doc
+        
+        return {employee_id: dict(doc) for employee_id, doc in found.items()}
+    
+    async def get(
+        self,
+        employee_id: str,
+        loader: Callable[[List[str]], Awaitable[Dict[str, dict]]],
+    ) -> Optional[dict]:
+        """Return a single employee doc, or None if it does not exist."""
+        docs = await self.get_many([employee_id], loader)
+        return docs.get(employee_id)
+    
+    def invalidate(self, employee_id: Optional[str] = None) -> None:
+        """Drop one employee, or the whole cache when no id is given."""
+        self._generation += 1
+        if employee_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(employee_id, None)
+    
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Employee directory shared by AttendanceService lookups
+employee_cache = EmployeeCache(settings.employee_cache_size, settings.employee_cache_ttl)
+
+
+class CollectionVersions:
+    """Per-collection write counters used as cheap version markers."""
+    
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+    
+    def get(self, collection: str) -> int:
+        """Current version of a collection."""
+        return self._versions.get(collection, 0)
+    
+    def bump(self, collection: str) -> int:
+        """Advance a collection's version after a write."""
+        self._versions[collection] = self.get(collection) + 1
+        return self._versions[collection]
+
+
+collection_versions = CollectionVersions()
+
+
+# Called with (collection, employee_id) after every local write; the
+# invalidation bus registers here to tell the other workers
+write_publishers: List[Callable[[str, Optional[str]], None]] = []
+
+
+def apply_write(collection: str, employee_id: Optional[str] = None) -> None:
+    """Bump a collection's version and drop the caches derived from it.
+    
+    Employee writes drop the given employee from the employee cache, or the
+    whole cache when no id is given.
+    """
+    collection_versions.bump(collection)
+    dashboard_cache.invalidate()
+    if collection == "employees":
+        employee_cache.invalidate(employee_id)
+
+
+def record_write(collection: str, employee_id: Optional[str] = None) -> None:
+    """Apply a write to this worker's caches and publish it to the others."""
+    apply_write(collection, employee_id)
+    for publish in write_publishers:
+        publish(collection, employee_id)
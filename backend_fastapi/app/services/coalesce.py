@@ -0,0 +1,99 @@
+import asyncio
+import inspect
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+from ..config.settings import settings
+from .cache import collection_versions
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn list/dict arguments into hashable tuples for use in a key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+class SingleFlight:
+    """Collapses concurrent identical reads into one in-flight query.
+    
+    The first caller for a key starts the query as a task; callers that
+    arrive while it is running await the same task instead of issuing
+    their own. Results are shared between callers and must not be mutated.
+    A caller that is cancelled (e.g. its client disconnected) does not
+    cancel the shared query for the others.
+    """
+    
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.issued: Dict[str, int] = {}
+        self.coalesced: Dict[str, int] = {}
+    
+    async def run(self, name: str, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of `call`, sharing it with concurrent callers of `key`."""
+        task = self._inflight.get(key)
+        if task is None:
+            self.issued[name] = self.issued.get(name, 0) + 1
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced[name] = self.coalesced.get(name, 0) + 1
+        return await asyncio.shield(task)
+    
+    def stats(self) -> dict:
+        """Return issued/coalesced counters, in total and per method."""
+        methods: List[dict] = [
+            {
+                "method": name,
+                "issued": self.issued.get(name, 0),
+                "coalesced": self.coalesced.get(name, 0),
+            }
+            for name in sorted(set(self.issued) | set(self.coalesced))
+        ]
+        issued = sum(self.issued.values())
+        coalesced = sum(self.coalesced.values())
+        calls = issued + coalesced
+        return {
+            "enabled": settings.request_coalescing,
+            "in_flight": len(self._inflight),
+            "issued": issued,
+            "coalesced": coalesced,
+            "coalesced_ratio": round(coalesced / calls, 4) if calls else 0.0,
+            "methods": methods,
+        }
+
+
+single_flight = SingleFlight()
+
+
+def coalesced(*collections: str) -> Callable:
+    """Decorate a service read method so concurrent identical calls share one query.
+    
+    The key is the method, the service's `read_scope`, the bound arguments
+    and the write versions of `collections`, so a call made after a write
+    never joins a query that started before it.
+    """
+    def decorator(method: Callable) -> Callable:
+        name = method.__qualname__
+        signature = inspect.signature(method)
+        
+        @wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            if not settings.request_coalescing:
+                return await method(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            key = (
+                name,
+                self.read_scope,
+                tuple(_freeze(value) for value in list(bound.arguments.values())[1:]),
+                tuple(collection_versions.get(collection) for collection in collections),
+            )
+            return await single_flight.run(name, key, lambda: method(self, *args, **kwargs))
+        
+        return wrapper
+    
+    return decorator
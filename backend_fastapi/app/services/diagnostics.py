@@ -0,0 +1,103 @@
+from typing import List
+from datetime import datetime, date, timedelta
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+
+class DiagnosticsService:
+    """Service class for database diagnostics."""
+    
+    def __init__(self, database: AsyncIOMotorDatabase):
+        self.database = database
+    
+    def _representative_queries(self) -> List[dict]:
+        """Queries issued by the service layer, with placeholder values."""
+        today = datetime.combine(date.today(), datetime.min.time())
+        placeholder_id = "000000000000000000000000"
+        return [
+            {
+                "name": "attendance_by_employee_and_date",
+                "collection": "attendance",
+                "filter": {"employee_id": placeholder_id, "date": today},
+                "sort": None,
+            },
+            {
+                "name": "attendance_by_employee",
+                "collection": "attendance",
+                "filter": {"employee_id": placeholder_id},
+                "sort": [("date", -1), ("_id", -1)],
+            },
+            {
+                "name": "attendance_by_date_range",
+                "collection": "attendance",
+                "filter": {"date": {"$gte": today - timedelta(days=30), "$lte": today}},
+                "sort": [("date", -1), ("_id", -1)],
+            },
+            {
+                "name": "employees_by_employee_id",
+                "collection": "employees",
+                "filter": {"employee_id": "EMP001"},
+                "sort": None,
+            },
+            {
+                "name": "employees_by_email",
+                "collection": "employees",
+                "filter": {"email": "employee@example.com"},
+                "sort": None,
+            },
+            {
+                "name": "employees_by_created_at",
+                "collection": "employees",
+                "filter": {},
+                "sort": [("created_at", -1), ("_id", -1)],
+            },
+        ]
+    
+    def _plan_stages(self, plan: dict) -> List[dict]:
+        """Flatten a query plan tree into its stages."""
+        stages = [plan]
+        if "inputStage" in plan:
+            stages.extend(self._plan_stages(plan["inputStage"]))
+        for child in plan.get("inputStages", []):
+            stages.extend(self._plan_stages(child))
+        return stages
+    
+    async def explain_queries(self) -> List[dict]:
+        """Explain each representative query and flag scans and in-memory sorts."""
+        reports = []
+        
+        for query in self._representative_queries():
+            cursor = self.database[query["collection"]].find(query["filter"])
+            if query["sort"]:
+                cursor = cursor.sort(query["sort"])
+            explain = await cursor.explain()
+            
+            planner = explain.get("queryPlanner", {})
+            winning_plan = planner.get("winningPlan", {})
+            # Newer servers nest the classic plan under queryPlan
+            winning_plan = winning_plan.get("queryPlan", winning_plan)
+            stages = self._plan_stages(winning_plan)
+            stage_names = [stage.get("stage") for stage in stages]
+            stats = explain.get("executionStats", {})
+            
+            collection_scan = "COLLSCAN" in stage_names
+            in_memory_sort = "SORT" in stage_names
+            reports.append({
+                "name": query["name"],
+                "collection": query["collection"],
+                "indexes_used": [stage["indexName"] for stage in stages if "indexName" in stage],
+                "collection_scan": collection_scan,
+                "in_memory_sort": in_memory_sort,
+                "docs_examined": stats.get("totalDocsExamined"),
+                "keys_examined": stats.get("totalKeysExamined"),
+                "slow_scan": collection_scan or in_memory_sort,
+            })
+        
+        return reports
+    
+    async def list_indexes(self) -> dict:
+        """List index names for the application collections."""
+        indexes = {}
+        for collection_name in ("attendance", "attendance_rollups", "employees"):
+            info = await self.database[collection_name].index_information()
+            indexes[collection_name] = sorted(info.keys())
+        return indexes
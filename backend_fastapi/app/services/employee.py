@@ -1,10 +1,16 @@
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi import HTTPException, status
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
-from ..models.employee import EmployeeCreate, EmployeeInDB, VALID_DEPARTMENTS
+from ..models.employee import EmployeeCreate, EmployeeInDB, EmployeeImportRowError, VALID_DEPARTMENTS
+from ..config.settings import settings
+from ..utils.pagination import encode_cursor, keyset_query
+from .cache import record_write
+from .coalesce import coalesced
 
 
 class EmployeeService:
@@ -12,16 +18,31 @@ class EmployeeService:
     
     def __init__(self, database: AsyncIOMotorDatabase):
         self.collection = database["employees"]
+        self.read_scope = self.collection.full_name
     
-    async def get_all(self) -> List[EmployeeInDB]:
-        """Get all employees sorted by creation date (newest first)."""
+    @coalesced("employees")
+    async def get_all(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = settings.default_page_size,
+    ) -> Tuple[List[EmployeeInDB], Optional[str]]:
+        """Get a page of employees sorted by creation date (newest first)."""
         employees = []
-        cursor = self.collection.find().sort("created_at", -1)
-        async for doc in cursor:
+        query = keyset_query({}, "created_at", cursor)
+        db_cursor = self.collection.find(query).sort([("created_at", -1), ("_id", -1)]).limit(limit + 1)
+        build = EmployeeInDB.model_construct if settings.fast_serialization else EmployeeInDB
+        async for doc in db_cursor:
             doc["_id"] = str(doc["_id"])
-            employees.append(EmployeeInDB(**doc))
-        return employees
+            employees.append(build(**doc))
+        
+        if len(employees) <= limit:
+            return employees, None
+        
+        employees = employees[:limit]
+        last = employees[-1]
+        return employees, encode_cursor(last.created_at, last.id)
     
+    @coalesced("employees")
     async def get_by_id(self, employee_id: str) -> Optional[EmployeeInDB]:
         """Get a single employee by MongoDB ID."""
         if not ObjectId.is_valid(employee_id):
@@ -66,11 +87,153 @@ class EmployeeService:
             "updated_at": now,
         }
         
-        result = await self.collection.insert_one(employee_doc)
+        try:
+            result = await self.collection.insert_one(employee_doc)
+        except DuplicateKeyError as exc:
+            # A concurrent create passed the checks above first
+            if "email" in (exc.details or {}).get("keyPattern", {}):
+                detail = f"Employee with email '{employee_data.email}' already exists"
+            else:
+                detail = f"Employee with ID '{employee_data.employee_id}' already exists"
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=detail
+            )
         employee_doc["_id"] = str(result.inserted_id)
+        record_write("employees", employee_doc["_id"])
         
         return EmployeeInDB(**employee_doc)
     
+    async def import_rows(
+        self,
+        rows: AsyncIterator[Tuple[int, Dict[str, str]]],
+        chunk_size: int = settings.import_chunk_size,
+    ) -> Tuple[int, int, List[EmployeeImportRowError]]:
+        """Validate and insert streamed (row number, record) pairs chunk by chunk.
+        
+        Returns the number of rows read, the number imported and an error
+        entry for every rejected row.
+        """
+        total = imported = 0
+        errors: List[EmployeeImportRowError] = []
+        # First row seen for each employee_id/email across the whole file
+        seen_ids: Dict[str, int] = {}
+        seen_emails: Dict[str, int] = {}
+        
+        chunk = []
+        async for row in rows:
+            chunk.append(row)
+            total += 1
+            if len(chunk) >= chunk_size:
+                imported += await self._import_chunk(chunk, seen_ids, seen_emails, errors)
+                chunk = []
+        if chunk:
+            imported += await self._import_chunk(chunk, seen_ids, seen_emails, errors)
+        
+        if imported:
+            record_write("employees")
+        return total, imported, errors
+    
+    async def _import_chunk(
+        self,
+        chunk: List[Tuple[int, Dict[str, str]]],
+        seen_ids: Dict[str, int],
+        seen_emails: Dict[str, int],
+        errors: List[EmployeeImportRowError],
+    ) -> int:
+        """Validate one chunk, check duplicates with a single query and insert it."""
+        valid: List[Tuple[int, EmployeeCreate]] = []
+        for row_number, record in chunk:
+            try:
+                employee = EmployeeCreate(**record)
+            except ValidationError as exc:
+                errors.append(EmployeeImportRowError(
+                    row=row_number,
+                    employee_id=record.get("employee_id") or None,
+                    email=record.get("email") or None,
+                    errors=[
+                        f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+                        for error in exc.errors()
+                    ],
+                ))
+                continue
+            
+            problems = []
+            if employee.employee_id in seen_ids:
+                problems.append(
+                    f"Duplicate employee_id '{employee.employee_id}' in file (row {seen_ids[employee.employee_id]})"
+                )
+            if employee.email in seen_emails:
+                problems.append(
+                    f"Duplicate email '{employee.email}' in file (row {seen_emails[employee.email]})"
+                )
+            if problems:
+                errors.append(EmployeeImportRowError(
+                    row=row_number,
+                    employee_id=employee.employee_id,
+                    email=employee.email,
+                    errors=problems,
+                ))
+                continue
+            seen_ids[employee.employee_id] = row_number
+            seen_emails[employee.email] = row_number
+            valid.append((row_number, employee))
+        
+        if not valid:
+            return 0
+        
+        existing_ids = set()
+        existing_emails = set()
+        cursor = self.collection.find(
+            {"$or": [
+                {"employee_id": {"$in": [employee.employee_id for _, employee in valid]}},
+                {"email": {"$in": [employee.email for _, employee in valid]}},
+            ]},
+            {"_id": 0, "employee_id": 1, "email": 1},
+        )
+        async for doc in cursor:
+            existing_ids.add(doc.get("employee_id"))
+            existing_emails.add(doc.get("email"))
+        
+        now = datetime.utcnow()
+        rows = []
+        docs = []
+        for row_number, employee in valid:
+            problems = []
+            if employee.employee_id in existing_ids:
+                problems.append(f"Employee with ID '{employee.employee_id}' already exists")
+            if employee.email in existing_emails:
+                problems.append(f"Employee with email '{employee.email}' already exists")
+            if problems:
+                errors.append(EmployeeImportRowError(
+                    row=row_number,
+                    employee_id=employee.employee_id,
+                    email=employee.email,
+                    errors=problems,
+                ))
+                continue
+            rows.append((row_number, employee))
+            docs.append({**employee.model_dump(), "created_at": now, "updated_at": now})
+        
+        if not docs:
+            return 0
+        
+        try:
+            result = await self.collection.insert_many(docs, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as exc:
+            # Rows that lost a race with a concurrent insert hit the unique indexes
+            for error in exc.details.get("writeErrors", []):
+                row_number, employee = rows[error["index"]]
+                message = "Employee already exists" if error.get("code") == 11000 else error.get("errmsg", "Insert failed")
+                errors.append(EmployeeImportRowError(
+                    row=row_number,
+                    employee_id=employee.employee_id,
+                    email=employee.email,
+                    errors=[message],
+                ))
+            return exc.details.get("nInserted", 0)
+    
     async def delete(self, employee_id: str) -> bool:
         """Delete an employee by MongoDB ID."""
         if not ObjectId.is_valid(employee_id):
@@ -80,8 +243,10 @@ class EmployeeService:
             )
         
         result = await self.collection.delete_one({"_id": ObjectId(employee_id)})
+        record_write("employees", employee_id)
         return result.deleted_count > 0
     
+    @coalesced("employees")
     async def get_department_stats(self) -> List[dict]:
         """Get employee count by department."""
         pipeline = [
@@ -93,6 +258,7 @@ class EmployeeService:
             stats.append(doc)
         return stats
     
+    @coalesced("employees")
     async def count(self) -> int:
         """Get total employee count."""
         return await self.collection.count_documents({})
@@ -0,0 +1,202 @@
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from ..config.settings import settings
+
+
+# Outcomes of IdempotencyStore.begin
+CLAIMED = "claimed"
+REPLAY = "replay"
+MISMATCH = "mismatch"
+BUSY = "busy"
+
+
+class IdempotencyStore:
+    """Responses stored by Idempotency-Key, shared by every worker.
+    
+    Each key is claimed with a `pending` document in `idempotency_keys`;
+    the first response is then written to the same document and expires
+    through a TTL index. A bounded in-memory LRU sits in front, and
+    duplicates arriving on the same worker while the first request runs
+    await it instead of polling MongoDB. A claim left behind by a crashed
+    worker can be taken over once its lock expires.
+    """
+    
+    def __init__(self, ttl: int, cache_size: int, lock_timeout: float, poll_interval: float = 0.1):
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.collection = None
+        self._cache: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.executed = 0
+        self.replayed = 0
+        self.mismatched = 0
+        self.cache_hits = 0
+        self.busy = 0
+    
+    def start(self, database: AsyncIOMotorDatabase) -> None:
+        self.collection = database["idempotency_keys"]
+    
+    def stop(self) -> None:
+        self.collection = None
+    
+    @property
+    def running(self) -> bool:
+        return self.collection is not None
+    
+    def _get_cached(self, key: str) -> Optional[dict]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, stored = entry
+        if time.monotonic() >= expires_at:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return stored
+    
+    def _put_cached(self, key: str, stored: dict) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self.ttl, stored)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
+    def _release(self, key: str) -> None:
+        waiter = self._inflight.pop(key, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+    
+    async def begin(self, key: str, fingerprint: str) -> Tuple[str, Optional[dict]]:
+        """Claim a key, or return the response already stored for it.
+        
+        Returns (CLAIMED, None) when the caller should run the request and
+        then call complete() or abandon(), (REPLAY, stored) for a finished
+        duplicate, (MISMATCH, None) if the key was first used with a
+        different body, and (BUSY, None) if the first request is still
+        running after `lock_timeout` seconds.
+        """
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            stored = self._get_cached(key)
+            if stored is not None:
+                self.cache_hits += 1
+                return self._replay(stored, fingerprint)
+            waiter = self._inflight.get(key)
+            if waiter is None:
+                break
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter), max(deadline - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                self.busy += 1
+                return BUSY, None
+        
+        # No request on this worker holds the key; claim it across workers
+        self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            outcome, stored = await self._claim(key, fingerprint, deadline)
+        except BaseException:
+            self._release(key)
+            raise
+        if outcome == CLAIMED:
+            self.executed += 1
+        else:
+            self._release(key)
+            if outcome == REPLAY:
+                return self._replay(stored, fingerprint)
+            self.busy += 1
+        return outcome, stored
+    
+    def _replay(self, stored: dict, fingerprint: str) -> Tuple[str, Optional[dict]]:
+        if stored["fingerprint"] != fingerprint:
+            self.mismatched += 1
+            return MISMATCH, None
+        self.replayed += 1
+        return REPLAY, stored
+    
+    async def _claim(self, key: str, fingerprint: str, deadline: float) -> Tuple[str, Optional[dict]]:
+        lock = timedelta(seconds=self.lock_timeout)
+        while True:
+            now = datetime.utcnow()
+            try:
+                await self.collection.insert_one({
+                    "_id": key,
+                    "state": "pending",
+                    "fingerprint": fingerprint,
+                    "created_at": now,
+                    "locked_until": now + lock,
+                })
+                return CLAIMED, None
+            except DuplicateKeyError:
+                pass
+            
+            doc = await self.collection.find_one({"_id": key})
+            if doc is None:
+                # Expired or abandoned in between; try again
+                continue
+            if doc["state"] == "done":
+                stored = {field: doc[field] for field in ("fingerprint", "status_code", "headers", "body")}
+                self._put_cached(key, stored)
+                return REPLAY, stored
+            if doc["locked_until"] <= now:
+                # The worker holding the claim died; take it over
+                taken = await self.collection.find_one_and_update(
+                    {"_id": key, "state": "pending", "locked_until": doc["locked_until"]},
+                    {"$set": {"fingerprint": fingerprint, "locked_until": now + lock}},
+                )
+                if taken:
+                    return CLAIMED, None
+                continue
+            if time.monotonic() >= deadline:
+                return BUSY, None
+            await asyncio.sleep(self.poll_interval)
+    
+    async def complete(self, key: str, stored: dict) -> None:
+        """Store the response of a claimed key and wake local duplicates."""
+        try:
+            await self.collection.update_one(
+                {"_id": key},
+                {"$set": {"state": "done", **stored}, "$unset": {"locked_until": ""}},
+            )
+            self._put_cached(key, stored)
+        finally:
+            self._release(key)
+    
+    async def abandon(self, key: str) -> None:
+        """Drop a claim whose request failed so a retry runs it again."""
+        try:
+            await self.collection.delete_one({"_id": key, "state": "pending"})
+        finally:
+            self._release(key)
+    
+    def stats(self) -> dict:
+        """Return replay counters and front cache size."""
+        return {
+            "running": self.running,
+            "ttl": self.ttl,
+            "cache_size": len(self._cache),
+            "max_cache_size": self.cache_size,
+            "in_flight": len(self._inflight),
+            "executed": self.executed,
+            "replayed": self.replayed,
+            "mismatched": self.mismatched,
+            "cache_hits": self.cache_hits,
+            "busy": self.busy,
+        }
+
+
+# Idempotency-Key responses, started and stopped by the app lifespan
+idempotency_store = IdempotencyStore(
+    settings.idempotency_ttl,
+    settings.idempotency_cache_size,
+    settings.idempotency_lock_timeout,
+)
@@ -0,0 +1,210 @@
+import asyncio
+import os
+import uuid
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+from ..config.settings import settings
+from .cache import apply_write, write_publishers
+from .live import live_feed
+
+
+# Identifies this worker's own events on shared channels
+WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+# Collections whose writes invalidate cached reads
+WATCHED_COLLECTIONS = ["employees", "attendance"]
+
+
+class InvalidationBus:
+    """Fans cache invalidations out to every worker process.
+    
+    The base class is the single-process bus: local writes already drop
+    local caches, so there is nothing to send or receive.
+    """
+    
+    kind = "local"
+    
+    def __init__(self):
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self, database: AsyncIOMotorDatabase) -> None:
+        """Begin publishing local writes and applying remote ones."""
+    
+    async def stop(self) -> None:
+        """Stop background work."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def receive(self, collection: str, employee_id: Optional[str]) -> None:
+        """Apply a write reported by another worker."""
+        self.received += 1
+        apply_write(collection, employee_id)
+        live_feed.refresh()
+    
+    def stats(self) -> dict:
+        """Return event counters."""
+        return {
+            "kind": self.kind,
+            "worker_id": WORKER_ID,
+            "published": self.published,
+            "received": self.received,
+            "errors": self.errors,
+        }
+
+
+class CappedCollectionBus(InvalidationBus):
+    """Invalidation bus over a tailable cursor on a capped collection.
+    
+    Works on a standalone MongoDB. Local writes are queued and inserted in
+    batches; every worker tails the collection and applies the events that
+    other workers wrote. Replaying an event twice is harmless, so a tail
+    that has to restart resumes slightly before its last event.
+    """
+    
+    kind = "capped"
+    
+    def __init__(self, size_bytes: int = settings.invalidation_capped_size):
+        super().__init__()
+        self.size_bytes = size_bytes
+        self._outbox: Optional[asyncio.Queue] = None
+        self._publisher: Optional[asyncio.Task] = None
+    
+    async def start(self, database: AsyncIOMotorDatabase) -> None:
+        try:
+            await database.create_collection(
+                "cache_invalidations", capped=True, size=self.size_bytes
+            )
+        except CollectionInvalid:
+            pass
+        self.collection = database["cache_invalidations"]
+        
+        # Only events written after this worker started are relevant
+        newest = await self.collection.find_one(sort=[("$natural", -1)])
+        since = newest["at"] if newest else datetime.utcnow()
+        
+        self._outbox = asyncio.Queue()
+        self._publisher = asyncio.create_task(self._publish_loop())
+        self._task = asyncio.create_task(self._tail_loop(since))
+        write_publishers.append(self.publish)
+    
+    async def stop(self) -> None:
+        if self.publish in write_publishers:
+            write_publishers.remove(self.publish)
+        # Flush pending events before shutting down
+        if self._outbox is not None:
+            await self._outbox.join()
+        if self._publisher is not None:
+            self._publisher.cancel()
+            try:
+                await self._publisher
+            except asyncio.CancelledError:
+                pass
+            self._publisher = None
+        await super().stop()
+    
+    def publish(self, collection: str, employee_id: Optional[str]) -> None:
+        """Queue a local write for the other workers."""
+        self._outbox.put_nowait((collection, employee_id))
+    
+    async def _publish_loop(self) -> None:
+        while True:
+            events: List[Tuple[str, Optional[str]]] = [await self._outbox.get()]
+            while not self._outbox.empty():
+                events.append(self._outbox.get_nowait())
+            now = datetime.utcnow()
+            try:
+                await self.collection.insert_many([
+                    {"origin": WORKER_ID, "collection": collection, "employee_id": employee_id, "at": now}
+                    for collection, employee_id in events
+                ])
+                self.published += len(events)
+            except Exception as exc:
+                self.errors += 1
+                print(f"⚠️  Could not publish cache invalidations: {exc}")
+            finally:
+                for _ in events:
+                    self._outbox.task_done()
+    
+    async def _tail_loop(self, since: datetime) -> None:
+        while True:
+            try:
+                cursor = self.collection.find(
+                    {"at": {"$gte": since}},
+                    cursor_type=CursorType.TAILABLE_AWAIT,
+                )
+                while cursor.alive:
+                    async for doc in cursor:
+                        since = max(since, doc["at"] - timedelta(seconds=1))
+                        if doc.get("origin") != WORKER_ID:
+                            self.receive(doc["collection"], doc.get("employee_id"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.errors += 1
+                print(f"⚠️  Cache invalidation tail failed, retrying: {exc}")
+            # A tailable cursor on an empty collection dies right away
+            await asyncio.sleep(settings.invalidation_retry_interval)
+
+
+class ChangeStreamBus(InvalidationBus):
+    """Invalidation bus driven by MongoDB change streams.
+    
+    Every worker watches the employee and attendance collections directly,
+    so writes are seen no matter which process or tool made them. Requires
+    a replica set or sharded cluster.
+    """
+    
+    kind = "change_stream"
+    
+    async def start(self, database: AsyncIOMotorDatabase) -> None:
+        self.database = database
+        self._task = asyncio.create_task(self._watch_loop())
+    
+    async def _watch_loop(self) -> None:
+        pipeline = [{"$match": {"ns.coll": {"$in": WATCHED_COLLECTIONS}}}]
+        resume_token = None
+        while True:
+            try:
+                async with self.database.watch(pipeline, resume_after=resume_token) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        collection = change["ns"]["coll"]
+                        employee_id = None
+                        if collection == "employees":
+                            employee_id = str(change["documentKey"]["_id"])
+                        self.receive(collection, employee_id)
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as exc:
+                self.errors += 1
+                # 40573: change streams are only supported on replica sets
+                if exc.code == 40573:
+                    print("⚠️  Change streams need a replica set; cross-worker cache invalidation is off")
+                    return
+                print(f"⚠️  Change stream failed, resuming: {exc}")
+            except Exception as exc:
+                self.errors += 1
+                print(f"⚠️  Change stream failed, resuming: {exc}")
+            await asyncio.sleep(settings.invalidation_retry_interval)
+
+
+def create_invalidation_bus(kind: str) -> InvalidationBus:
+    """Build the bus selected by INVALIDATION_BUS."""
+    buses = {
+        "local": InvalidationBus,
+        "capped": CappedCollectionBus,
+        "change_stream": ChangeStreamBus,
+    }
+    return buses[kind]()
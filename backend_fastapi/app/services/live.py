@@ -0,0 +1,180 @@
+import asyncio
+import json
+from collections import deque
+from itertools import count
+from typing import AsyncIterator, Deque, Optional, Set, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..config.settings import settings
+from .attendance import AttendanceService
+
+
+class Subscription:
+    """One client's bounded event buffer.
+    
+    When the buffer is full the oldest event is dropped, so a slow client
+    falls behind on history but never blocks the broadcaster. Every event
+    carries the full today counters, so the latest one is always enough to
+    redraw the dashboard.
+    """
+    
+    def __init__(self, buffer_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+    
+    def put(self, message: Optional[str]) -> bool:
+        """Buffer a message; returns True if an older one was dropped for it."""
+        dropped = self.queue.full()
+        if dropped:
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+        return dropped
+
+
+class LiveFeed:
+    """In-process broadcaster fanning change events out to SSE subscribers.
+    
+    Writes handled by this worker publish a detailed event; writes reported
+    by other workers through the invalidation bus, and bulk writes, only
+    trigger a `counters` refresh.
+    
+    Events wait in a bounded queue drained by a single publisher task,
+    which computes today's counters once for every batch of queued events,
+    so a burst of writes costs a few count queries rather than one each.
+    """
+    
+    def __init__(self, buffer_size: int, max_subscribers: int):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self._service: Optional[AttendanceService] = None
+        self._subscribers: Set[Subscription] = set()
+        self._pending: Deque[Tuple[str, dict]] = deque(maxlen=buffer_size)
+        self._publisher: Optional[asyncio.Task] = None
+        self._closing = False
+        self._ids = count(1)
+        self.published = 0
+        self.counter_queries = 0
+        self.discarded = 0
+        self.dropped = 0
+        self.failures = 0
+    
+    def start(self, database: AsyncIOMotorDatabase) -> None:
+        self._service = AttendanceService(database)
+        self._pending.clear()
+        self._closing = False
+    
+    def close(self) -> None:
+        """Refuse new subscribers and end every open stream.
+        
+        Called as soon as the server is asked to shut down, since it only
+        runs the lifespan shutdown once in-flight responses have finished.
+        """
+        self._closing = True
+        for subscription in list(self._subscribers):
+            subscription.put(None)
+    
+    async def stop(self) -> None:
+        """Close every open stream and cancel pending publishes."""
+        self.close()
+        if self._publisher is not None:
+            self._publisher.cancel()
+        self._pending.clear()
+        self._service = None
+    
+    @property
+    def running(self) -> bool:
+        return self._service is not None
+    
+    def accepting(self) -> bool:
+        """Whether a new client can subscribe."""
+        return self.running and not self._closing and len(self._subscribers) < self.max_subscribers
+    
+    async def today(self) -> dict:
+        """Today's counters, in the dashboard's `today_stats` shape."""
+        return await self._service.get_today_stats()
+    
+    def format(self, event: str, data: dict) -> str:
+        """Encode one SSE message."""
+        return f"id: {next(self._ids)}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    
+    def notify(self, event: str, data: dict) -> None:
+        """Queue an event for publishing with refreshed today counters, without blocking the caller."""
+        if self.running and self._subscribers:
+            self._enqueue(event, data)
+    
+    def refresh(self) -> None:
+        """Publish fresh counters, unless an already queued event will carry them."""
+        if self.running and self._subscribers and not self._pending:
+            self._enqueue("counters", {})
+    
+    def _enqueue(self, event: str, data: dict) -> None:
+        if len(self._pending) == self._pending.maxlen:
+            # The oldest event would be dropped by a full client buffer anyway
+            self.discarded += 1
+        self._pending.append((event, data))
+        if self._publisher is None or self._publisher.done():
+            self._publisher = asyncio.create_task(self._publish_pending())
+    
+    async def _publish_pending(self) -> None:
+        # Yield once so writes in the same burst share one count query
+        await asyncio.sleep(0)
+        # A single publisher sends events in order, so counters never go backwards
+        while self._pending:
+            events = list(self._pending)
+            self._pending.clear()
+            try:
+                self.counter_queries += 1
+                today = await self.today()
+            except Exception as exc:
+                self.failures += 1
+                print(f"⚠️  Could not publish {len(events)} live event(s): {exc}")
+                continue
+            for event, data in events:
+                message = self.format(event, {**data, "today": today})
+                self.published += 1
+                for subscription in list(self._subscribers):
+                    if subscription.put(message):
+                        self.dropped += 1
+    
+    async def stream(self, keepalive: float) -> AsyncIterator[str]:
+        """Subscribe and yield SSE messages, starting with the current counters.
+        
+        The client is registered only once the response starts streaming
+        and removed when it disconnects.
+        """
+        if self._closing:
+            return
+        subscription = Subscription(self.buffer_size)
+        self._subscribers.add(subscription)
+        try:
+            yield self.format("counters", {"today": await self.today()})
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(), keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            self._subscribers.discard(subscription)
+    
+    def stats(self) -> dict:
+        """Return subscriber and event counters."""
+        return {
+            "running": self.running,
+            "closing": self._closing,
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "buffer_size": self.buffer_size,
+            "published": self.published,
+            "counter_queries": self.counter_queries,
+            "discarded": self.discarded,
+            "failures": self.failures,
+            "dropped": self.dropped,
+        }
+
+
+# Dashboard live feed, started and stopped by the app lifespan
+live_feed = LiveFeed(settings.live_feed_buffer_size, settings.live_feed_max_subscribers)
@@ -0,0 +1,174 @@
+import asyncio
+from typing import List, Optional
+from datetime import datetime
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from fastapi import HTTPException, status
+from pymongo.errors import OperationFailure
+
+from ..config.settings import settings
+from .cache import record_write
+
+
+class PurgeService:
+    """Service class for deleting employees together with their history.
+    
+    Tombstoned deletes remove the employee document right away and record
+    the intent in `employee_tombstones`; attendance is then purged in
+    bounded batches and the tombstone removed. A tombstone that outlives a
+    crash or shutdown is picked up again on the next start.
+    """
+    
+    def __init__(self, database: AsyncIOMotorDatabase):
+        self.client = database.client
+        self.collection = database["employee_tombstones"]
+        self.employees_collection = database["employees"]
+        self.attendance_collection = database["attendance"]
+        self.buckets_collection = database["attendance_buckets"]
+        self.rollups_collection = database["attendance_rollups"]
+    
+    async def tombstone(self, employee_id: str) -> bool:
+        """Record a pending purge and delete the employee document."""
+        await self.collection.update_one(
+            {"_id": employee_id},
+            {"$setOnInsert": {"deleted_at": datetime.utcnow()}},
+            upsert=True,
+        )
+        result = await self.employees_collection.delete_one({"_id": ObjectId(employee_id)})
+        record_write("employees", employee_id)
+        return result.deleted_count > 0
+    
+    async def pending(self) -> List[str]:
+        """Employee ids whose purge has not finished, oldest first."""
+        cursor = self.collection.find({}, {"_id": 1}).sort("deleted_at", 1)
+        return [doc["_id"] async for doc in cursor]
+    
+    async def purge(self, employee_id: str, batch_size: int = settings.purge_batch_size) -> int:
+        """Delete an employee's attendance in batches, then drop the tombstone.
+        
+        Newest records go first so today's counters settle after one batch.
+        """
+        purged = 0
+        while True:
+            cursor = self.attendance_collection.find(
+                {"employee_id": employee_id}, {"_id": 1}
+            ).sort("date", -1).limit(batch_size)
+            ids = [doc["_id"] async for doc in cursor]
+            if not ids:
+                break
+            result = await self.attendance_collection.delete_many({"_id": {"$in": ids}})
+            purged += result.deleted_count
+            record_write("attendance")
+            # Let request handlers run between batches
+            await asyncio.sleep(0)
+        
+        # Bucketed storage holds at most one document per month
+        await self.buckets_collection.delete_many({"employee_id": employee_id})
+        await self.rollups_collection.delete_many({"employee_id": employee_id})
+        # No-op unless the request that wrote the tombstone failed midway
+        await self.employees_collection.delete_one({"_id": ObjectId(employee_id)})
+        await self.collection.delete_one({"_id": employee_id})
+        return purged
+    
+    async def delete_in_transaction(self, employee_id: str) -> bool:
+        """Delete an employee, their attendance and rollups atomically.
+        
+        Requires a replica set or sharded cluster.
+        """
+        async def cascade(session) -> bool:
+            await self.attendance_collection.delete_many({"employee_id": employee_id}, session=session)
+            await self.buckets_collection.delete_many({"employee_id": employee_id}, session=session)
+            await self.rollups_collection.delete_many({"employee_id": employee_id}, session=session)
+            result = await self.employees_collection.delete_one({"_id": ObjectId(employee_id)}, session=session)
+            return result.deleted_count > 0
+        
+        try:
+            async with await self.client.start_session() as session:
+                deleted = await session.with_transaction(cascade)
+        except OperationFailure as exc:
+            # Standalone servers reject transactions with IllegalOperation
+            if exc.code == 20:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Transactional delete requires a MongoDB replica set"
+                )
+            raise
+        
+        record_write("employees", employee_id)
+        record_write("attendance")
+        return deleted
+
+
+class PurgeQueue:
+    """In-process background queue that runs tombstoned purges one at a time."""
+    
+    def __init__(self):
+        self._service: Optional[PurgeService] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.purged_employees = 0
+        self.purged_records = 0
+        self.failures = 0
+    
+    async def start(self, database: AsyncIOMotorDatabase) -> None:
+        """Start the worker and resume purges left over from a previous run."""
+        self._service = PurgeService(database)
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        pending = await self._service.pending()
+        for employee_id in pending:
+            self.enqueue(employee_id)
+        if pending:
+            print(f"🧹 Resuming attendance purge for {len(pending)} deleted employees")
+    
+    async def stop(self) -> None:
+        """Stop the worker; unfinished purges resume on the next start."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+        self._queue = None
+    
+    def enqueue(self, employee_id: str) -> bool:
+        """Schedule a purge; returns False when the worker is not running."""
+        if self._queue is None:
+            return False
+        self._queue.put_nowait(employee_id)
+        return True
+    
+    async def _run(self) -> None:
+        while True:
+            employee_id = await self._queue.get()
+            try:
+                self.purged_records += await self._service.purge(employee_id)
+                self.purged_employees += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # The tombstone stays, so the purge is retried on the next start
+                self.failures += 1
+                print(f"⚠️  Could not purge attendance for employee {employee_id}: {exc}")
+            finally:
+                self._queue.task_done()
+    
+    async def join(self) -> None:
+        """Wait until every queued purge has finished."""
+        if self._queue is not None:
+            await self._queue.join()
+    
+    def stats(self) -> dict:
+        """Return queue depth and purge counters."""
+        return {
+            "running": self._worker is not None,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "purged_employees": self.purged_employees,
+            "purged_records": self.purged_records,
+            "failures": self.failures,
+        }
+
+
+# Background purge worker for tombstoned employee deletes
+purge_queue = PurgeQueue()
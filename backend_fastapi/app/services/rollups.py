@@ -0,0 +1,229 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, date
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from ..config.settings import settings
+from .buckets import STATUS_CODES, expand_stages
+
+
+# Month key of the per-employee all-time rollup
+ALL_MONTHS = "all"
+
+STATUS_FIELDS = {
+    "Present": "present",
+    "Absent": "absent",
+}
+
+
+def month_key(attendance_date: date) -> str:
+    """Rollup month key for a date, e.g. 2024-01."""
+    return attendance_date.strftime("%Y-%m")
+
+
+class RollupService:
+    """Service class for materialized per-employee attendance counters.
+    
+    Each employee has one rollup document per month plus one for all time,
+    holding present/absent/total counts. Attendance writes keep them up to
+    date with $inc; rebuild() recomputes them from raw attendance.
+    
+    Increments alone only count marks made after rollups were introduced,
+    so an employee's rollups are trusted once their all-time document is
+    `seeded`: computed from raw attendance by seed() or rebuild().
+    """
+    
+    def __init__(self, database: AsyncIOMotorDatabase, storage: Optional[str] = None):
+        self.collection = database["attendance_rollups"]
+        self.bucketed = (storage or settings.attendance_storage) == "bucketed"
+        self.attendance_collection = database["attendance_buckets" if self.bucketed else "attendance"]
+    
+    def delta(self, previous_status: Optional[str], new_status: str) -> Dict[str, int]:
+        """Counter changes for a record moving from previous_status to new_status."""
+        if previous_status == new_status:
+            return {}
+        if previous_status is None:
+            return {STATUS_FIELDS[new_status]: 1, "total": 1}
+        return {STATUS_FIELDS[previous_status]: -1, STATUS_FIELDS[new_status]: 1}
+    
+    async def apply(self, changes: Iterable[Tuple[str, date, Optional[str], str]]) -> None:
+        """Apply (employee_id, date, previous_status, new_status) changes in one bulk write."""
+        increments: Dict[Tuple[str, str], Dict[str, int]] = {}
+        for employee_id, attendance_date, previous_status, new_status in changes:
+            delta = self.delta(previous_status, new_status)
+            if not delta:
+                continue
+            for month in (month_key(attendance_date), ALL_MONTHS):
+                counters = increments.setdefault((employee_id, month), {})
+                for field, value in delta.items():
+                    counters[field] = counters.get(field, 0) + value
+        
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"employee_id": employee_id, "month": month},
+                {"$inc": counters, "$set": {"updated_at": now}},
+                upsert=True,
+            )
+            for (employee_id, month), counters in increments.items()
+            if any(counters.values())
+        ]
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+    
+    async def get_totals(self, employee_id: str) -> Optional[dict]:
+        """All-time counters for an employee, or None if no rollup exists."""
+        return await self.collection.find_one({"employee_id": employee_id, "month": ALL_MONTHS})
+    
+    async def seed(self, employee_id: str) -> dict:
+        """Replace an employee's rollups with counts from raw attendance.
+        
+        Month rollups are written first and the all-time rollup last, with
+        `seeded` set, so readers never trust a partial set. A mark landing
+        while the raw counts are read can be missed or counted twice;
+        find_drift() and rebuild() repair that.
+        """
+        pipeline = [
+            {"$match": {"employee_id": employee_id}},
+            *self._group_stages(by_month=True),
+        ]
+        totals = {"present": 0, "absent": 0, "total": 0}
+        operations = []
+        now = datetime.utcnow()
+        async for doc in self.attendance_collection.aggregate(pipeline):
+            counters = {field: doc[field] for field in totals}
+            for field, value in counters.items():
+                totals[field] += value
+            operations.append(UpdateOne(
+                {"employee_id": employee_id, "month": doc["_id"]["month"]},
+                {"$set": {**counters, "updated_at": now}},
+                upsert=True,
+            ))
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+        
+        try:
+            # Another request may have seeded in the meantime; keep its counts
+            await self.collection.update_one(
+                {"employee_id": employee_id, "month": ALL_MONTHS, "seeded": {"$ne": True}},
+                {"$set": {**totals, "seeded": True, "updated_at": now}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return await self.get_totals(employee_id)
+        return {"employee_id": employee_id, "month": ALL_MONTHS, **totals, "seeded": True}
+    
+    async def get_months(self, employee_id: str) -> List[dict]:
+        """Per-month counters for an employee, newest month first."""
+        months = []
+        cursor = self.collection.find(
+            {"employee_id": employee_id, "month": {"$ne": ALL_MONTHS}},
+            {"_id": 0, "month": 1, "present": 1, "absent": 1, "total": 1},
+        ).sort("month", -1)
+        async for doc in cursor:
+            months.append({
+                "month": doc["month"],
+                "present": doc.get("present", 0),
+                "absent": doc.get("absent", 0),
+                "total": doc.get("total", 0),
+            })
+        return months
+    
+    async def delete_by_employee(self, employee_id: str) -> int:
+        """Delete all rollups for an employee."""
+        result = await self.collection.delete_many({"employee_id": employee_id})
+        return result.deleted_count
+    
+    def _group_stages(self, by_month: bool) -> List[dict]:
+        """Stages counting raw attendance per employee (and month) on either schema."""
+        if self.bucketed:
+            stages = expand_stages()
+            status_field = "$code"
+            present, absent = STATUS_CODES["Present"], STATUS_CODES["Absent"]
+        else:
+            stages = [{"$addFields": {"month": {"$dateToString": {"format": "%Y-%m", "date": "$date"}}}}]
+            status_field = "$status"
+            present, absent = "Present", "Absent"
+        
+        group_id = {"employee_id": "$employee_id"}
+        if by_month:
+            group_id["month"] = "$month"
+        return stages + [{
+            "$group": {
+                "_id": group_id,
+                "present": {"$sum": {"$cond": [{"$eq": [status_field, present]}, 1, 0]}},
+                "absent": {"$sum": {"$cond": [{"$eq": [status_field, absent]}, 1, 0]}},
+                "total": {"$sum": 1},
+            }
+        }]
+    
+    async def find_drift(self) -> List[dict]:
+        """Compare all-time rollups with raw attendance and list mismatches."""
+        expected = {}
+        async for doc in self.attendance_collection.aggregate(self._group_stages(by_month=False)):
+            expected[doc["_id"]["employee_id"]] = {
+                "present": doc["present"],
+                "absent": doc["absent"],
+                "total": doc["total"],
+            }
+        
+        actual = {}
+        async for doc in self.collection.find({"month": ALL_MONTHS}):
+            actual[doc["employee_id"]] = {
+                "present": doc.get("present", 0),
+                "absent": doc.get("absent", 0),
+                "total": doc.get("total", 0),
+            }
+        
+        drift = []
+        empty = {"present": 0, "absent": 0, "total": 0}
+        for employee_id in expected.keys() | actual.keys():
+            want = expected.get(employee_id, empty)
+            have = actual.get(employee_id, empty)
+            if want != have:
+                drift.append({"employee_id": employee_id, "expected": want, "actual": have})
+        return drift
+    
+    async def rebuild(self) -> dict:
+        """Recompute every rollup from raw attendance on the server."""
+        started = datetime.utcnow()
+        
+        for by_month in (True, False):
+            month = "$_id.month" if by_month else {"$literal": ALL_MONTHS}
+            pipeline = [
+                *self._group_stages(by_month),
+                {
+                    "$project": {
+                        "_id": 0,
+                        "employee_id": "$_id.employee_id",
+                        "month": month,
+                        "present": 1,
+                        "absent": 1,
+                        "total": 1,
+                        "seeded": {"$literal": True},
+                        "rebuilt_at": {"$literal": started},
+                    }
+                },
+                {
+                    "$merge": {
+                        "into": self.collection.name,
+                        "on": ["employee_id", "month"],
+                        "whenMatched": "replace",
+                        "whenNotMatched": "insert",
+                    }
+                },
+            ]
+            async for _ in self.attendance_collection.aggregate(pipeline):
+                pass
+        
+        # Rollups neither rebuilt nor incremented since the rebuild started
+        # have no attendance behind them
+        stale = await self.collection.delete_many({
+            "$and": [
+                {"$or": [{"rebuilt_at": {"$lt": started}}, {"rebuilt_at": {"$exists": False}}]},
+                {"$or": [{"updated_at": {"$lt": started}}, {"updated_at": {"$exists": False}}]},
+            ]
+        })
+        rollups = await self.collection.count_documents({})
+        return {"rollups": rollups, "removed_stale": stale.deleted_count}
@@ -0,0 +1,3 @@
+from .pagination import encode_cursor, decode_cursor, keyset_query
+from .responses import ORJSONResponse, fast_response
+from .etag import make_etag, etag_matches, not_modified, with_etag
@@ -0,0 +1,67 @@
+import codecs
+import csv
+from typing import AsyncIterator, Dict, List, Tuple
+from fastapi import HTTPException, status
+
+
+async def iter_csv_records(
+    chunks: AsyncIterator[bytes],
+    required_columns: List[str],
+) -> AsyncIterator[Tuple[int, Dict[str, str]]]:
+    """Parse a streamed UTF-8 CSV body into (row number, record) pairs.
+    
+    The first row is the header; data rows are numbered from 2 like in a
+    spreadsheet. Only complete records are parsed, so quoted fields may
+    span lines and chunk boundaries.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    header = None
+    row_number = 0
+    pending = ""
+    finished = False
+    while not finished:
+        try:
+            chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            chunk = b""
+            finished = True
+        try:
+            pending += decoder.decode(chunk, final=finished)
+        except UnicodeDecodeError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="CSV upload must be UTF-8 encoded"
+            )
+        
+        # Parse up to the last line break that is outside quotes; an even
+        # number of quote characters means no quoted field is still open
+        if finished:
+            complete, pending = pending, ""
+        else:
+            cut = pending.rfind("\n") + 1
+            while cut and pending.count('"', 0, cut) % 2:
+                cut = pending.rfind("\n", 0, cut - 1) + 1
+            complete, pending = pending[:cut], pending[cut:]
+        if not complete:
+            continue
+        
+        for values in csv.reader(complete.splitlines(keepends=True)):
+            row_number += 1
+            if header is None:
+                header = [value.strip().lower() for value in values]
+                missing = [column for column in required_columns if column not in header]
+                if missing:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"CSV header is missing columns: {', '.join(missing)}"
+                    )
+                continue
+            if not any(value.strip() for value in values):
+                continue
+            yield row_number, dict(zip(header, values))
+    
+    if header is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV upload is empty"
+        )
@@ -0,0 +1,40 @@
+import hashlib
+import uuid
+from typing import Any, Optional
+from fastapi import Request, Response
+
+
+# Distinguishes version counters of this process from any other process or restart
+BOOT_ID = uuid.uuid4().hex
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a weak ETag from version markers and request parameters."""
+    digest = hashlib.sha1("|".join(str(part) for part in (BOOT_ID, *parts)).encode()).hexdigest()
+    return f'W/"{digest[:24]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches the ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison: ignore the W/ prefix on both sides
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag."""
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def with_etag(result: Any, response: Optional[Response], etag: str) -> Any:
+    """Attach the ETag to a returned Response, or to FastAPI's injected response."""
+    if isinstance(result, Response):
+        result.headers["ETag"] = etag
+    elif response is not None:
+        response.headers["ETag"] = etag
+    return result
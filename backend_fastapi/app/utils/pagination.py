@@ -0,0 +1,42 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from bson import ObjectId
+from fastapi import HTTPException, status
+
+
+def encode_cursor(sort_value: datetime, doc_id: str) -> str:
+    """Encode a (sort value, _id) keyset position as an opaque cursor."""
+    payload = json.dumps({"v": sort_value.isoformat(), "id": str(doc_id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Decode an opaque cursor back into its (sort value, _id) position."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["v"]), ObjectId(payload["id"])
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def keyset_query(query: dict, field: str, cursor: Optional[str]) -> dict:
+    """Restrict a query to documents after the cursor in (field, _id) descending order."""
+    if not cursor:
+        return query
+    
+    sort_value, doc_id = decode_cursor(cursor)
+    after_cursor = {
+        "$or": [
+            {field: {"$lt": sort_value}},
+            {field: sort_value, "_id": {"$lt": doc_id}},
+        ]
+    }
+    if not query:
+        return after_cursor
+    return {"$and": [query, after_cursor]}
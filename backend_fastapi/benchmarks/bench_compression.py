@@ -0,0 +1,90 @@
+"""
+Benchmark: bytes on the wire and CPU per request for response compression.
+
+Builds attendance list payloads the way the fast serialization path does,
+serves them through CompressionMiddleware both as a single JSON response
+and as a streamed NDJSON export, and requests them with each encoding.
+Reports wire bytes, compression ratio and CPU milliseconds per request
+(including the identity baseline). No database is needed.
+
+Run from backend_fastapi/:
+    python -m benchmarks.bench_compression --records 1000 10000 --gzip-levels 1 6 9 --brotli-qualities 1 4 8
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+import orjson
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from app.middleware.compression import CompressionMiddleware, brotli
+from benchmarks.bench_serialization import fast_path, make_docs
+
+STREAM_BATCH_SIZE = 2000
+
+
+def build_app(body: bytes, lines: list, **options) -> CompressionMiddleware:
+    async def list_endpoint(request):
+        return Response(body, media_type="application/json")
+
+    async def export_endpoint(request):
+        async def chunks():
+            for start in range(0, len(lines), STREAM_BATCH_SIZE):
+                yield b"".join(lines[start:start + STREAM_BATCH_SIZE])
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    app = Starlette(routes=[Route("/list", list_endpoint), Route("/export", export_endpoint)])
+    return CompressionMiddleware(app, **options)
+
+
+async def measure(app, path: str, encoding: str, repeat: int) -> dict:
+    wire_bytes = 0
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        started = time.process_time()
+        for _ in range(repeat):
+            async with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+                wire_bytes = sum([len(chunk) async for chunk in response.aiter_raw()])
+        cpu = time.process_time() - started
+    return {"wire_bytes": wire_bytes, "cpu_ms_per_request": round(cpu / repeat * 1000, 2)}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--gzip-levels", type=int, nargs="+", default=[1, 6, 9])
+    parser.add_argument("--brotli-qualities", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    configs = [("identity", {})]
+    configs += [("gzip", {"gzip_level": level}) for level in args.gzip_levels]
+    if brotli is not None:
+        configs += [("br", {"brotli_quality": quality}) for quality in args.brotli_qualities]
+
+    results = []
+    for count in args.records:
+        docs = make_docs(count)
+        body = fast_path(docs)
+        lines = [orjson.dumps(record) + b"\n" for record in orjson.loads(body)["data"]]
+        for path, raw_size in (("/list", len(body)), ("/export", sum(map(len, lines)))):
+            for encoding, options in configs:
+                app = build_app(body, lines, **options)
+                result = await measure(app, path, encoding, args.repeat)
+                results.append({
+                    "records": count,
+                    "path": path,
+                    "encoding": encoding,
+                    **options,
+                    "raw_bytes": raw_size,
+                    **result,
+                    "ratio": round(raw_size / result["wire_bytes"], 1),
+                })
+    print(json.dumps({"brotli_available": brotli is not None, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
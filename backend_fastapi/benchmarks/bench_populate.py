@@ -0,0 +1,163 @@
+"""
+Benchmark: per-row vs batched employee population for attendance lists.
+
+Seeds a scratch database, then reads every attendance record twice:
+once through a per-row lookup (the original `_populate_employee` path,
+kept here as the baseline) and once through the batched
+`_populate_employees` path. Both paths run the same query and build
+records the same way (FAST_SERIALIZATION applies to both, and request
+coalescing is bypassed), so only the population strategy differs.
+Reports Mongo round trips (counted with a pymongo CommandListener) and
+wall-clock latency for each.
+
+Run from backend_fastapi/ against a local MongoDB:
+    python -m benchmarks.bench_populate --employees 2000 --days 20
+    python -m benchmarks.bench_populate --fast-serialization
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, date, timedelta
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from app.config.settings import settings
+from app.models.attendance import AttendanceInDB, EmployeeInfo
+from app.services.attendance import AttendanceService
+from app.services.cache import employee_cache
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Count commands sent to MongoDB."""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def seed(database, employees: int, days: int):
+    """Insert employees and one attendance record per employee per day."""
+    await database["employees"].drop()
+    await database["attendance"].drop()
+
+    now = datetime.utcnow()
+    employee_docs = [
+        {
+            "employee_id": f"EMP{i:05d}",
+            "full_name": f"Employee {i}",
+            "email": f"employee{i}@example.com",
+            "department": "Engineering",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(employees)
+    ]
+    result = await database["employees"].insert_many(employee_docs)
+
+    start = date.today() - timedelta(days=days)
+    attendance_docs = [
+        {
+            "employee_id": str(employee_id),
+            "date": datetime.combine(start + timedelta(days=d), datetime.min.time()),
+            "status": "Present" if (i + d) % 5 else "Absent",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for d in range(days)
+        for i, employee_id in enumerate(result.inserted_ids)
+    ]
+    await database["attendance"].insert_many(attendance_docs)
+    return len(attendance_docs)
+
+
+async def populate_employee(service: AttendanceService, attendance_doc: dict) -> dict:
+    """Populate employee info in one attendance document with its own query."""
+    if "employee_id" in attendance_doc:
+        employee = await service.employees_collection.find_one({
+            "_id": ObjectId(attendance_doc["employee_id"])
+        })
+        if employee:
+            employee["_id"] = str(employee["_id"])
+            build = EmployeeInfo.model_construct if settings.fast_serialization else EmployeeInfo
+            attendance_doc["employee"] = build(**employee)
+    return attendance_doc
+
+
+async def per_row(service: AttendanceService):
+    """Baseline path: one employee lookup per attendance record."""
+    build = AttendanceInDB.model_construct if settings.fast_serialization else AttendanceInDB
+    records = []
+    async for doc in service.collection.find({}).sort([("date", -1), ("_id", -1)]):
+        doc["_id"] = str(doc["_id"])
+        doc["date"] = doc["date"].date()
+        doc = await populate_employee(service, doc)
+        records.append(build(**doc))
+    return records
+
+
+async def batched(service: AttendanceService):
+    """Optimized path: one `$in` lookup for all records, cold cache.
+
+    Calls the uncoalesced query helper behind get_all directly.
+    """
+    employee_cache.invalidate()
+    return await service._fetch_records({})
+
+
+async def measure(name, fn, service, counter):
+    counter.count = 0
+    started = time.perf_counter()
+    records = await fn(service)
+    elapsed = time.perf_counter() - started
+    return {
+        "path": name,
+        "records": len(records),
+        "round_trips": counter.count,
+        "latency_ms": round(elapsed * 1000, 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default=settings.mongodb_url)
+    parser.add_argument("--database", default="hrms_lite_bench")
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--fast-serialization", action="store_true", help="Build records without revalidation")
+    args = parser.parse_args()
+    settings.fast_serialization = args.fast_serialization
+
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(args.url, event_listeners=[counter])
+    database = client[args.database]
+
+    try:
+        total = await seed(database, args.employees, args.days)
+        service = AttendanceService(database)
+        results = [
+            await measure("per_row", per_row, service, counter),
+            await measure("batched", batched, service, counter),
+        ]
+        print(json.dumps({
+            "seeded_records": total,
+            "fast_serialization": settings.fast_serialization,
+            "results": results,
+        }, indent=2))
+    finally:
+        await client.drop_database(args.database)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
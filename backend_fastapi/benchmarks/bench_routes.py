@@ -0,0 +1,262 @@
+"""
+Benchmark suite: latency, throughput and DB commands for the main routes.
+
+Seeds a scratch database with employees, daily attendance and matching
+rollups, then drives the real FastAPI app in-process through
+httpx.AsyncClient at a fixed concurrency. For every scenario it reports
+p50/p95/p99 latency, throughput and MongoDB commands per request as JSON.
+Pass --baseline with an earlier report to add percentage changes.
+
+Run from backend_fastapi/ against a local MongoDB:
+    python -m benchmarks.bench_routes --employees 5000 --days 730 --output run.json
+    python -m benchmarks.bench_routes --baseline run.json
+Or without a server (smaller data; no command counts):
+    python -m benchmarks.bench_routes --backend mongomock --employees 500 --days 60
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, date, timedelta
+
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config.database import db
+from app.config.indexes import ensure_indexes
+from app.config.monitoring import command_metrics, pool_metrics
+from app.config.settings import settings
+from app.main import app
+from app.services.rollups import ALL_MONTHS, month_key
+
+DEPARTMENTS = ["Engineering", "Finance", "Marketing", "Sales", "Operations", "IT"]
+SEED_BATCH_SIZE = 20000
+
+
+async def seed(database, employees: int, days: int, rng: random.Random) -> dict:
+    """Insert employees, one attendance record per employee per day, and rollups."""
+    for name in ("employees", "attendance", "attendance_rollups"):
+        await database[name].drop()
+
+    now = datetime.utcnow()
+    employee_docs = [
+        {
+            "employee_id": f"EMP{i:05d}",
+            "full_name": f"Employee {i}",
+            "email": f"employee{i}@example.com",
+            "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now,
+        }
+        for i in range(employees)
+    ]
+    result = await database["employees"].insert_many(employee_docs)
+    employee_ids = [str(inserted_id) for inserted_id in result.inserted_ids]
+
+    rollups = {}
+    batch = []
+    records = 0
+    start = date.today() - timedelta(days=days - 1)
+    for d in range(days):
+        day = start + timedelta(days=d)
+        for employee_id in employee_ids:
+            status = "Present" if rng.random() < 0.9 else "Absent"
+            batch.append({
+                "employee_id": employee_id,
+                "date": datetime.combine(day, datetime.min.time()),
+                "status": status,
+                "created_at": now,
+                "updated_at": now,
+            })
+            for month in (month_key(day), ALL_MONTHS):
+                counters = rollups.setdefault((employee_id, month), {"present": 0, "absent": 0, "total": 0})
+                counters[status.lower()] += 1
+                counters["total"] += 1
+            if len(batch) >= SEED_BATCH_SIZE:
+                await database["attendance"].insert_many(batch, ordered=False)
+                records += len(batch)
+                batch = []
+    if batch:
+        await database["attendance"].insert_many(batch, ordered=False)
+        records += len(batch)
+
+    # Rollups computed from the seeded records are complete, so mark the
+    # all-time ones seeded; otherwise each first summary would re-seed
+    await database["attendance_rollups"].insert_many([
+        {
+            "employee_id": employee_id,
+            "month": month,
+            **counters,
+            **({"seeded": True} if month == ALL_MONTHS else {}),
+            "updated_at": now,
+        }
+        for (employee_id, month), counters in rollups.items()
+    ])
+    return {"employees": employees, "days": days, "attendance_records": records, "employee_ids": employee_ids}
+
+
+def scenarios(employee_ids: list, days: int, rng: random.Random) -> list:
+    """(name, request factory) pairs; factories return (method, path, json body)."""
+    today = date.today()
+
+    def list_attendance():
+        return "GET", "/api/attendance?limit=100", None
+
+    def list_attendance_range():
+        start = today - timedelta(days=rng.randrange(days))
+        return "GET", f"/api/attendance?start_date={start}&end_date={start + timedelta(days=6)}&limit=100", None
+
+    def dashboard():
+        return "GET", "/api/attendance/dashboard", None
+
+    def summary():
+        return "GET", f"/api/attendance/summary/{rng.choice(employee_ids)}", None
+
+    def mark_attendance():
+        body = {
+            "employee_id": rng.choice(employee_ids),
+            "date": str(today - timedelta(days=rng.randrange(days))),
+            "status": rng.choice(["Present", "Absent"]),
+        }
+        return "POST", "/api/attendance", body
+
+    return [
+        ("list_attendance", list_attendance),
+        ("list_attendance_range", list_attendance_range),
+        ("dashboard", dashboard),
+        ("summary", summary),
+        ("mark_attendance", mark_attendance),
+    ]
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, round(pct / 100 * (len(values) - 1)))
+    return values[index]
+
+
+async def run_scenario(client, name, factory, requests: int, concurrency: int, count_commands: bool) -> dict:
+    """Send `requests` requests from `concurrency` concurrent clients."""
+    latencies = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, path, body = factory()
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            elapsed = (time.perf_counter() - started) * 1000
+            if response.status_code < 400:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    commands_before = command_metrics.commands
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    commands = command_metrics.commands - commands_before
+
+    return {
+        "scenario": name,
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "db_commands_per_request": round(commands / requests, 2) if count_commands else None,
+    }
+
+
+def compare(results: list, baseline: dict) -> None:
+    """Annotate results with percentage changes against a previous report."""
+    previous = {result["scenario"]: result for result in baseline.get("results", [])}
+    for result in results:
+        before = previous.get(result["scenario"])
+        if not before:
+            continue
+        result["change_pct"] = {
+            key: round((result[key] - before[key]) / before[key] * 100, 1)
+            for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+            if before.get(key)
+        }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["mongo", "mongomock"], default="mongo")
+    parser.add_argument("--url", default=settings.mongodb_url)
+    parser.add_argument("--database", default="hrms_lite_bench")
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--scenario", nargs="+", help="Only run these scenarios")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Also write the report to this file")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    args = parser.parse_args()
+
+    if args.backend == "mongomock":
+        from mongomock_motor import AsyncMongoMockClient
+        client = AsyncMongoMockClient()
+    else:
+        client = AsyncIOMotorClient(args.url, event_listeners=[pool_metrics, command_metrics])
+    database = client[args.database]
+    db.client, db.database = client, database
+
+    rng = random.Random(args.seed)
+    try:
+        started = time.perf_counter()
+        seeded = await seed(database, args.employees, args.days, rng)
+        if args.backend == "mongo":
+            await ensure_indexes(database)
+        seed_seconds = round(time.perf_counter() - started, 1)
+
+        selected = scenarios(seeded.pop("employee_ids"), args.days, rng)
+        if args.scenario:
+            selected = [scenario for scenario in selected if scenario[0] in args.scenario]
+
+        transport = httpx.ASGITransport(app=app)
+        limits = httpx.Limits(max_connections=args.concurrency)
+        results = []
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=60) as http:
+            for name, factory in selected:
+                results.append(await run_scenario(
+                    http, name, factory, args.requests, args.concurrency,
+                    count_commands=args.backend == "mongo",
+                ))
+
+        report = {
+            "config": {
+                "backend": args.backend,
+                "concurrency": args.concurrency,
+                "requests_per_scenario": args.requests,
+                "fast_serialization": settings.fast_serialization,
+            },
+            "seed": {**seeded, "seconds": seed_seconds},
+            "results": results,
+        }
+        if args.baseline:
+            with open(args.baseline) as f:
+                compare(results, json.load(f))
+        output = json.dumps(report, indent=2)
+        print(output)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(output)
+    finally:
+        if args.backend == "mongo":
+            await client.drop_database(args.database)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
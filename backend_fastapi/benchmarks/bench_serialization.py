@@ -0,0 +1,118 @@
+"""
+Benchmark: response building and serialization for attendance lists.
+
+Compares the validated path (AttendanceInDB(**doc), FastAPI-style response
+model revalidation, stdlib json) with the fast path (model_construct,
+single model_dump, orjson). Reports CPU time and peak traced memory.
+No database is needed; documents are synthesized in memory.
+
+Run from backend_fastapi/:
+    python -m benchmarks.bench_serialization --records 10000 100000
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from datetime import datetime, date, timedelta
+
+import orjson
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+from app.models.attendance import AttendanceInDB, AttendanceListResponse, EmployeeInfo
+
+
+def make_docs(count: int, employees: int = 2000) -> list:
+    """Synthesize attendance documents as they look after population."""
+    now = datetime.utcnow()
+    employee_docs = [
+        {
+            "_id": str(ObjectId()),
+            "employee_id": f"EMP{i:05d}",
+            "full_name": f"Employee {i}",
+            "email": f"employee{i}@example.com",
+            "department": "Engineering",
+        }
+        for i in range(employees)
+    ]
+    start = date.today()
+    return [
+        {
+            "_id": str(ObjectId()),
+            "employee_id": employee_docs[i % employees]["_id"],
+            "employee_doc": employee_docs[i % employees],
+            "date": start - timedelta(days=i // employees),
+            "status": "Present" if i % 5 else "Absent",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+response_adapter = TypeAdapter(AttendanceListResponse)
+
+
+def validated_path(docs: list) -> bytes:
+    """Current path: validate every record, revalidate the response, stdlib json."""
+    records = []
+    for doc in docs:
+        doc = dict(doc)
+        doc["employee"] = EmployeeInfo(**doc.pop("employee_doc"))
+        records.append(AttendanceInDB(**doc))
+    response = AttendanceListResponse(success=True, count=len(records), data=records)
+    # FastAPI validates the return value against response_model, then dumps it
+    value = response_adapter.validate_python(response, from_attributes=True)
+    content = response_adapter.dump_python(value, mode="json", by_alias=True)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def fast_path(docs: list) -> bytes:
+    """Optimized path: construct once, dump once, encode with orjson."""
+    employees = {}
+    records = []
+    for doc in docs:
+        doc = dict(doc)
+        employee_doc = doc.pop("employee_doc")
+        employee = employees.get(employee_doc["_id"])
+        if employee is None:
+            employee = employees[employee_doc["_id"]] = EmployeeInfo.model_construct(**employee_doc)
+        doc["employee"] = employee
+        records.append(AttendanceInDB.model_construct(**doc))
+    response = AttendanceListResponse.model_construct(success=True, count=len(records), data=records)
+    return orjson.dumps(response.model_dump(by_alias=True))
+
+
+def measure(name: str, fn, docs: list) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    started = time.process_time()
+    body = fn(docs)
+    cpu = time.process_time() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "path": name,
+        "records": len(docs),
+        "cpu_ms": round(cpu * 1000, 1),
+        "peak_memory_mb": round(peak / 1024 / 1024, 1),
+        "bytes": len(body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    results = []
+    for count in args.records:
+        docs = make_docs(count)
+        results.append(measure("validated", validated_path, docs))
+        results.append(measure("fast", fast_path, docs))
+    print(json.dumps({"results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark: daily vs bucketed attendance storage.
+
+Seeds daily attendance (see bench_routes), migrates it into monthly buckets,
+then reports document count, data size, storage size and index size of both
+collections, and the latency of the same range queries served through
+AttendanceService on each schema.
+
+Run from backend_fastapi/ against a local MongoDB:
+    python -m benchmarks.bench_storage --employees 5000 --days 730 --queries 200
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config.indexes import ensure_indexes
+from app.config.settings import settings
+from app.services.attendance import AttendanceService
+from app.services.buckets import AttendanceBucketStore
+from app.services.cache import employee_cache
+from benchmarks.bench_routes import percentile, seed
+
+
+async def collection_stats(database, name: str) -> dict:
+    stats = await database.command("collStats", name)
+    return {
+        "documents": stats["count"],
+        "data_mb": round(stats["size"] / 1024 / 1024, 1),
+        "storage_mb": round(stats["storageSize"] / 1024 / 1024, 1),
+        "index_mb": round(stats["totalIndexSize"] / 1024 / 1024, 1),
+    }
+
+
+def range_queries(employee_ids: list, days: int, rng: random.Random) -> list:
+    """(name, call) pairs; each call runs one query against a service."""
+    today = date.today()
+
+    def week_page(service):
+        start = today - timedelta(days=rng.randrange(7, days))
+        return service.get_all(start, start + timedelta(days=6), limit=100)
+
+    def newest_page(service):
+        return service.get_all(limit=100)
+
+    def employee_quarter(service):
+        start = today - timedelta(days=rng.randrange(90, days))
+        return service.get_by_employee(rng.choice(employee_ids), start, start + timedelta(days=89))
+
+    def employee_history(service):
+        return service.get_by_employee(rng.choice(employee_ids))
+
+    return [
+        ("newest_page", newest_page),
+        ("week_page", week_page),
+        ("employee_quarter", employee_quarter),
+        ("employee_history", employee_history),
+    ]
+
+
+async def time_queries(service, call, queries: int) -> dict:
+    latencies = []
+    for _ in range(queries):
+        started = time.perf_counter()
+        await call(service)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.mongodb_url)
+    parser.add_argument("--database", default="hrms_lite_bench")
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--queries", type=int, default=200, help="Queries per scenario and schema")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(args.url)
+    database = client[args.database]
+    rng = random.Random(args.seed)
+    try:
+        seeded = await seed(database, args.employees, args.days, rng)
+        await database["attendance_buckets"].drop()
+        await ensure_indexes(database)
+
+        started = time.perf_counter()
+        migration = await AttendanceBucketStore(database).migrate_from(database["attendance"])
+        migration["seconds"] = round(time.perf_counter() - started, 1)
+
+        storage = {
+            "daily": await collection_stats(database, "attendance"),
+            "bucketed": await collection_stats(database, "attendance_buckets"),
+        }
+
+        # Warm the employee cache once so both schemas pay the same lookup cost
+        employee_cache.invalidate()
+        await AttendanceService(database, "daily").get_all(limit=args.employees)
+
+        latency = []
+        for name, call in range_queries(seeded["employee_ids"], args.days, rng):
+            for schema in ("daily", "bucketed"):
+                service = AttendanceService(database, schema)
+                state = rng.getstate()
+                result = await time_queries(service, call, args.queries)
+                # Replay the same random ranges on the other schema
+                if schema == "daily":
+                    rng.setstate(state)
+                latency.append({"query": name, "schema": schema, **result})
+
+        print(json.dumps({
+            "seed": {key: value for key, value in seeded.items() if key != "employee_ids"},
+            "migration": migration,
+            "storage": storage,
+            "latency": latency,
+        }, indent=2))
+    finally:
+        await client.drop_database(args.database)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+Load test: API throughput by worker count.
+
+Starts `python -m app.serve` with each requested worker count, drives one
+endpoint with a fixed number of concurrent clients for a fixed duration,
+then stops the server with SIGTERM (graceful shutdown). Reports requests
+per second and latency percentiles for each worker count.
+
+Run from backend_fastapi/ against a MongoDB with some data in it:
+    python -m benchmarks.bench_workers --workers 1 2 4 --concurrency 64 --duration 15
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    """Poll /health until the server answers."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, round(pct / 100 * (len(values) - 1)))
+    return values[index]
+
+
+async def drive(base_url: str, path: str, concurrency: int, duration: float) -> dict:
+    """Issue requests from `concurrency` clients until `duration` elapses."""
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        deadline = time.monotonic() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append((time.perf_counter() - started) * 1000)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+async def run(workers: int, args) -> dict:
+    base_url = f"http://127.0.0.1:{args.port}"
+    env = dict(os.environ, METRICS_ENABLED="false")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--host", "127.0.0.1", "--port", str(args.port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        await wait_until_ready(base_url)
+        await drive(base_url, args.path, args.concurrency, args.warmup)
+        result = await drive(base_url, args.path, args.concurrency, args.duration)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    return {"workers": workers, **result}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/api/employees?limit=100")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = [await run(workers, args) for workers in args.workers]
+    baseline = results[0]["throughput_rps"] or 1
+    for result in results:
+        result["speedup"] = round(result["throughput_rps"] / baseline, 2)
+    print(json.dumps({"path": args.path, "concurrency": args.concurrency, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+"""
+Migrate daily attendance documents into per-employee-per-month buckets.
+
+Groups the `attendance` collection on the server and merges the result into
+`attendance_buckets`; days already present in a bucket are kept, so the
+migration can be re-run after switching ATTENDANCE_STORAGE=bucketed. Record
+counts of both collections are compared afterwards. Run from backend_fastapi/:
+    python -m scripts.migrate_attendance_buckets              # migrate and verify
+    python -m scripts.migrate_attendance_buckets --verify     # compare counts only
+    python -m scripts.migrate_attendance_buckets --drop-daily # migrate, then drop `attendance` if counts match
+"""
+import argparse
+import asyncio
+import json
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config.indexes import ensure_indexes
+from app.config.settings import settings
+from app.services.buckets import AttendanceBucketStore
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verify", action="store_true", help="Compare record counts without migrating")
+    parser.add_argument("--drop-daily", action="store_true", help="Drop the daily collection after a verified migration")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    database = client[settings.database_name]
+    try:
+        buckets = AttendanceBucketStore(database)
+        daily = database["attendance"]
+
+        if args.verify:
+            report = await buckets.verify_against(daily)
+        else:
+            # $merge needs the unique (employee_id, month) index
+            await ensure_indexes(database)
+            report = await buckets.migrate_from(daily)
+        report["verified"] = report["daily_records"] == report["bucketed_records"]
+
+        if args.drop_daily and not args.verify:
+            if report["verified"]:
+                await daily.drop()
+                report["dropped_daily"] = True
+            else:
+                report["dropped_daily"] = False
+
+        print(json.dumps(report, indent=2))
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
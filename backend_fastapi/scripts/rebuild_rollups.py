@@ -0,0 +1,43 @@
+"""
+Rebuild attendance rollups from raw attendance records.
+
+Reports employees whose all-time rollup disagrees with raw attendance,
+then recomputes every rollup on the server. Run from backend_fastapi/:
+    python -m scripts.rebuild_rollups           # report drift and rebuild
+    python -m scripts.rebuild_rollups --check   # report drift only
+"""
+import argparse
+import asyncio
+import json
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config.indexes import ensure_indexes
+from app.config.settings import settings
+from app.services.rollups import RollupService
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--check", action="store_true", help="Report drift without rebuilding")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    database = client[settings.database_name]
+    try:
+        rollups = RollupService(database)
+        drift = await rollups.find_drift()
+        report = {"drifted_employees": len(drift), "drift": drift[:50]}
+
+        if not args.check:
+            # $merge needs the unique (employee_id, month) index
+            await ensure_indexes(database)
+            report["rebuild"] = await rollups.rebuild()
+
+        print(json.dumps(report, indent=2, default=str))
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
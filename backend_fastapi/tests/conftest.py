@@ -0,0 +1,70 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from app.config.database import db
+from app.config.indexes import ensure_indexes
+from app.services.cache import dashboard_cache, employee_cache
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def database():
+    """A fresh in-memory database with the service indexes, wired into get_database()."""
+    db.client = AsyncMongoMockClient()
+    db.database = db.client["hrms_test"]
+    employee_cache.invalidate()
+    dashboard_cache.invalidate()
+    await ensure_indexes(db.database)
+    yield db.database
+    db.client = None
+    db.database = None
+
+
+@pytest.fixture
+def interleave():
+    """Make collection methods yield to the event loop before running.
+    
+    mongomock-motor completes each call without suspending, so concurrent
+    coroutines never interleave; yielding first lets read-then-write races
+    show up the way they would against a real server.
+    """
+    def patch(collection, *methods: str):
+        for name in methods:
+            method = getattr(collection, name)
+            
+            async def yielding(*args, _method=method, **kwargs):
+                await asyncio.sleep(0)
+                return await _method(*args, **kwargs)
+            
+            setattr(collection, name, yielding)
+        return collection
+    
+    return patch
+
+
+@pytest.fixture
+def create_employees(database):
+    """Insert N employees and return their MongoDB ids."""
+    async def create(count: int) -> list:
+        now = datetime.utcnow()
+        result = await database["employees"].insert_many([
+            {
+                "employee_id": f"EMP{i:04d}",
+                "full_name": f"Employee {i}",
+                "email": f"employee{i}@example.com",
+                "department": "Engineering",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(count)
+        ])
+        return [str(employee_id) for employee_id in result.inserted_ids]
+    
+    return create
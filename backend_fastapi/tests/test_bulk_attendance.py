@@ -0,0 +1,20 @@
+import httpx
+import pytest
+
+from app.config.settings import settings
+from app.main import app
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_oversized_bulk_request_is_rejected_by_validation(database, create_employees):
+    (employee_id,) = await create_employees(1)
+    record = {"employee_id": employee_id, "date": "2024-03-01", "status": "Present"}
+    
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/api/attendance/bulk", json={"records": [record] * (settings.max_bulk_size + 1)})
+    
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
+    assert await database["attendance"].count_documents({}) == 0
@@ -0,0 +1,61 @@
+import asyncio
+from datetime import date, datetime
+
+import httpx
+import pytest
+
+from app.main import app
+from app.services.attendance import AttendanceService
+from app.services.cache import collection_versions
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_write_during_dashboard_query_is_not_cached_under_new_etag(database, create_employees, monkeypatch):
+    (employee_id,) = await create_employees(1)
+    released = asyncio.Event()
+    get_today_counts = AttendanceService.get_today_counts
+    
+    async def slow_today_counts(self, *args, **kwargs):
+        counts = await get_today_counts(self, *args, **kwargs)
+        await released.wait()
+        return counts
+    
+    monkeypatch.setattr(AttendanceService, "get_today_counts", slow_today_counts)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        # The first dashboard read is still querying when attendance is marked
+        stale = asyncio.ensure_future(client.get("/api/attendance/dashboard"))
+        await asyncio.sleep(0.05)
+        marked = await client.post("/api/attendance", json={
+            "employee_id": employee_id,
+            "date": date.today().isoformat(),
+            "status": "Present",
+        })
+        assert marked.status_code == 201
+        released.set()
+        assert (await stale).json()["data"]["today_stats"]["present"] == 0
+        
+        fresh = await client.get("/api/attendance/dashboard")
+        assert fresh.json()["data"]["today_stats"]["present"] == 1
+        etag = fresh.headers["ETag"]
+        revalidated = await client.get("/api/attendance/dashboard", headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+
+
+async def test_cached_dashboard_is_only_served_under_its_own_etag(database, create_employees):
+    (employee_id,) = await create_employees(1)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        first = await client.get("/api/attendance/dashboard")
+        
+        # A write on another worker bumps the versions; the cached entry stays
+        collection_versions.bump("attendance")
+        await database["attendance"].insert_one({
+            "employee_id": employee_id,
+            "date": datetime.combine(date.today(), datetime.min.time()),
+            "status": "Present",
+        })
+        
+        second = await client.get("/api/attendance/dashboard")
+        assert second.headers["ETag"] != first.headers["ETag"]
+        assert second.json()["data"]["today_stats"]["present"] == 1
@@ -0,0 +1,43 @@
+from datetime import date
+
+import httpx
+import pytest
+
+from app.config.settings import settings
+from app.main import app
+from app.models.attendance import AttendanceCreate
+from app.services.attendance import AttendanceService
+from app.services.purge import PurgeService
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_tombstone_delete_purges_inline_when_queue_is_not_running(database, create_employees, monkeypatch):
+    monkeypatch.setattr(settings, "employee_delete_mode", "tombstone")
+    (employee_id,) = await create_employees(1)
+    await AttendanceService(database).mark_attendance(
+        AttendanceCreate(employee_id=employee_id, date=date(2024, 3, 1), status="Present")
+    )
+    
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.delete(f"/api/employees/{employee_id}")
+    
+    assert response.status_code == 200
+    assert response.json()["data"] == {"attendance_purge": "done"}
+    assert await database["attendance"].count_documents({"employee_id": employee_id}) == 0
+    assert await database["employee_tombstones"].count_documents({}) == 0
+
+
+@pytest.mark.parametrize("storage", ["daily", "bucketed"])
+async def test_today_counts_leave_out_employees_awaiting_purge(database, create_employees, storage):
+    employee_ids = await create_employees(2)
+    service = AttendanceService(database, storage)
+    for employee_id in employee_ids:
+        await service.mark_attendance(AttendanceCreate(employee_id=employee_id, date=date.today(), status="Present"))
+    
+    # Tombstoned but not purged yet: the attendance is still there
+    await PurgeService(database).tombstone(employee_ids[0])
+    
+    stats = await service.get_today_stats()
+    assert (stats["present"], stats["absent"], stats["not_marked"]) == (1, 0, 0)
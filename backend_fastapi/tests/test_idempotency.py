@@ -0,0 +1,23 @@
+import pytest
+
+from app.services.idempotency import CLAIMED, MISMATCH, REPLAY, IdempotencyStore
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("cache_size", [10, 0])
+async def test_reused_key_with_different_body_is_counted_as_mismatch(database, cache_size):
+    store = IdempotencyStore(ttl=60, cache_size=cache_size, lock_timeout=1)
+    store.start(database)
+    key = "POST /api/employees key-1"
+    stored = {"fingerprint": "body-a", "status_code": 201, "headers": [], "body": b"{}"}
+    
+    assert await store.begin(key, "body-a") == (CLAIMED, None)
+    await store.complete(key, stored)
+    
+    assert await store.begin(key, "body-a") == (REPLAY, stored)
+    assert await store.begin(key, "body-b") == (MISMATCH, None)
+    
+    stats = store.stats()
+    assert (stats["executed"], stats["replayed"], stats["mismatched"]) == (1, 1, 1)
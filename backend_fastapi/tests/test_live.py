@@ -0,0 +1,44 @@
+import pytest
+
+from app.services.live import LiveFeed
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_close_ends_open_streams_and_refuses_new_ones(database):
+    feed = LiveFeed(buffer_size=8, max_subscribers=10)
+    feed.start(database)
+    stream = feed.stream(keepalive=60)
+    
+    first = await stream.__anext__()
+    assert first.startswith("id: 1\nevent: counters\n")
+    assert feed.stats()["subscribers"] == 1
+    
+    feed.close()
+    assert not feed.accepting()
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    assert feed.stats()["subscribers"] == 0
+    assert [message async for message in feed.stream(keepalive=60)] == []
+    
+    await feed.stop()
+
+
+async def test_burst_of_events_shares_one_counter_query(database):
+    feed = LiveFeed(buffer_size=64, max_subscribers=10)
+    feed.start(database)
+    stream = feed.stream(keepalive=60)
+    await stream.__anext__()
+    
+    for index in range(50):
+        feed.notify("attendance_marked", {"index": index})
+    feed.refresh()
+    messages = [await stream.__anext__() for _ in range(50)]
+    
+    assert [f'"index": {index},' in message for index, message in enumerate(messages)] == [True] * 50
+    stats = feed.stats()
+    assert (stats["published"], stats["counter_queries"], stats["discarded"]) == (50, 1, 0)
+    
+    await stream.aclose()
+    await feed.stop()
@@ -0,0 +1,76 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from app.models.attendance import AttendanceCreate
+from app.services.attendance import AttendanceService
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_marks_leave_one_record_per_employee_and_date(database, create_employees, interleave):
+    employee_ids = await create_employees(5)
+    days = [date(2024, 3, 1) + timedelta(days=offset) for offset in range(4)]
+    service = AttendanceService(database)
+    interleave(service.collection, "find_one", "find_one_and_update", "insert_one", "update_one")
+    
+    # 15 marks for every (employee, date) pair, alternating status, all at once
+    marks = [
+        AttendanceCreate(
+            employee_id=employee_id,
+            date=day,
+            status="Present" if attempt % 2 else "Absent",
+        )
+        for attempt in range(15)
+        for employee_id in employee_ids
+        for day in days
+    ]
+    assert len(marks) == 300
+    await asyncio.gather(*(service.mark_attendance(mark) for mark in marks))
+    
+    pairs = [
+        (doc["employee_id"], doc["date"].date())
+        async for doc in database["attendance"].find({}, {"employee_id": 1, "date": 1})
+    ]
+    assert len(pairs) == len(employee_ids) * len(days)
+    assert set(pairs) == {(employee_id, day) for employee_id in employee_ids for day in days}
+
+
+async def test_losing_upsert_race_is_retried_as_update(database, create_employees):
+    (employee_id,) = await create_employees(1)
+    day = date(2024, 3, 1)
+    service = AttendanceService(database)
+    collection = service.collection
+    upsert = collection.find_one_and_update
+    calls = []
+    
+    async def racing_find_one_and_update(query, update, **kwargs):
+        calls.append(kwargs.get("upsert", False))
+        if kwargs.get("upsert"):
+            # Another request marks Present between our match and insert
+            await upsert(
+                query,
+                {"$set": {"status": "Present"}, "$setOnInsert": update["$setOnInsert"]},
+                upsert=True,
+            )
+            await service.rollups.apply([(employee_id, day, None, "Present")])
+            raise DuplicateKeyError("E11000 duplicate key error", 11000)
+        return await upsert(query, update, **kwargs)
+    
+    collection.find_one_and_update = racing_find_one_and_update
+    record = await service.mark_attendance(
+        AttendanceCreate(employee_id=employee_id, date=day, status="Absent")
+    )
+    
+    assert calls == [True, False]
+    assert record.status == "Absent"
+    docs = await database["attendance"].find({"employee_id": employee_id}).to_list(None)
+    assert len(docs) == 1
+    assert docs[0]["status"] == "Absent"
+    
+    # The retry saw the racing Present record, so the rollups record a flip
+    totals = await service.rollups.get_totals(employee_id)
+    assert (totals["present"], totals["absent"]) == (0, 1)
@@ -0,0 +1,73 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.attendance import AttendanceCreate
+from app.services.attendance import AttendanceService
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("storage", ["daily", "bucketed"])
+async def test_summary_counts_history_from_before_rollups(database, create_employees, storage):
+    (employee_id,) = await create_employees(1)
+    service = AttendanceService(database, storage)
+    days = [date(2024, 2, 27) + timedelta(days=offset) for offset in range(5)]
+    for day in days:
+        await service.mark_attendance(AttendanceCreate(employee_id=employee_id, date=day, status="Present"))
+    
+    # Attendance recorded before rollups existed has no rollup behind it
+    await database["attendance_rollups"].delete_many({})
+    
+    # Flipping a status now leaves a partial rollup: total 0, present -1
+    await service.mark_attendance(AttendanceCreate(employee_id=employee_id, date=days[-1], status="Absent"))
+    
+    result = await service.get_employee_summary(employee_id)
+    assert result["summary"] == {"total_days": 5, "present_days": 4, "absent_days": 1}
+    assert result["months"] == [
+        {"month": "2024-03", "present": 1, "absent": 1, "total": 2},
+        {"month": "2024-02", "present": 3, "absent": 0, "total": 3},
+    ]
+    
+    # Once seeded, later flips are counted incrementally
+    await service.mark_attendance(AttendanceCreate(employee_id=employee_id, date=days[0], status="Absent"))
+    result = await service.get_employee_summary(employee_id)
+    assert result["summary"] == {"total_days": 5, "present_days": 3, "absent_days": 2}
+    assert await service.rollups.find_drift() == []
+
+
+async def test_summary_for_employee_without_attendance(database, create_employees):
+    (employee_id,) = await create_employees(1)
+    service = AttendanceService(database)
+    
+    result = await service.get_employee_summary(employee_id)
+    assert result["summary"] == {"total_days": 0, "present_days": 0, "absent_days": 0}
+    assert result["months"] == []
+    
+    await service.mark_attendance(AttendanceCreate(employee_id=employee_id, date=date(2024, 3, 1), status="Present"))
+    result = await service.get_employee_summary(employee_id)
+    assert result["summary"] == {"total_days": 1, "present_days": 1, "absent_days": 0}
+
+
+@pytest.mark.parametrize("storage", ["daily", "bucketed"])
+async def test_concurrent_bulk_marks_count_each_record_once(database, create_employees, interleave, storage):
+    employee_ids = await create_employees(3)
+    service = AttendanceService(database, storage)
+    records_collection = service.buckets.collection if service.buckets else service.collection
+    interleave(records_collection, "find_one_and_update", "bulk_write")
+    for employee_id in employee_ids:
+        await service.get_employee_summary(employee_id)
+    
+    # The same entries arrive in several bulk requests at once
+    records = [
+        AttendanceCreate(employee_id=employee_id, date=date(2024, 3, 1), status="Present")
+        for employee_id in employee_ids
+    ]
+    await asyncio.gather(*(service.mark_attendance_bulk(records) for _ in range(4)))
+    
+    for employee_id in employee_ids:
+        result = await service.get_employee_summary(employee_id)
+        assert result["summary"] == {"total_days": 1, "present_days": 1, "absent_days": 0}
+    assert await service.rollups.find_drift() == []
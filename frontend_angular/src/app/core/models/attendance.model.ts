@@ -30,6 +30,8 @@ export interface AttendanceResponse {
 export interface AttendanceListResponse {
   success: boolean;
   count: number;
+  limit?: number;
+  next_cursor?: string | null;
   data: Attendance[];
 }
 
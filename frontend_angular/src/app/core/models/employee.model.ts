@@ -24,5 +24,7 @@ export interface EmployeeResponse {
 export interface EmployeeListResponse {
   success: boolean;
   count: number;
+  limit?: number;
+  next_cursor?: string | null;
   data: Employee[];
 }
@@ -1,6 +1,7 @@
 import { Injectable } from '@angular/core';
 import { HttpClient, HttpParams } from '@angular/common/http';
-import { Observable } from 'rxjs';
+import { EMPTY, Observable } from 'rxjs';
+import { expand, reduce } from 'rxjs/operators';
 import { environment } from '@environments/environment.development';
 import {
   AttendanceCreate,
@@ -16,16 +17,32 @@ import {
 export class AttendanceService {
   private apiUrl = `${environment.apiUrl}/api/attendance`;
 
+  // Largest page the API accepts (MAX_PAGE_SIZE)
+  private pageSize = 1000;
+
   constructor(private http: HttpClient) {}
 
-  getAll(startDate?: string, endDate?: string): Observable<AttendanceListResponse> {
-    let params = new HttpParams();
+  getPage(startDate?: string, endDate?: string, cursor?: string, limit = this.pageSize): Observable<AttendanceListResponse> {
+    let params = new HttpParams().set('limit', limit);
     if (startDate) params = params.set('start_date', startDate);
     if (endDate) params = params.set('end_date', endDate);
+    if (cursor) params = params.set('cursor', cursor);
     
     return this.http.get<AttendanceListResponse>(this.apiUrl, { params });
   }
 
+  // Follows next_cursor until the last page and returns every record
+  getAll(startDate?: string, endDate?: string): Observable<AttendanceListResponse> {
+    return this.getPage(startDate, endDate).pipe(
+      expand(page => page.next_cursor ? this.getPage(startDate, endDate, page.next_cursor) : EMPTY),
+      reduce((all, page) => ({
+        ...page,
+        count: all.count + page.count,
+        data: all.data.concat(page.data)
+      }))
+    );
+  }
+
   getByEmployee(employeeId: string, startDate?: string, endDate?: string): Observable<AttendanceListResponse> {
     let params = new HttpParams();
     if (startDate) params = params.set('start_date', startDate);
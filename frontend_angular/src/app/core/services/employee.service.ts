@@ -1,6 +1,7 @@
 import { Injectable } from '@angular/core';
-import { HttpClient } from '@angular/common/http';
-import { Observable } from 'rxjs';
+import { HttpClient, HttpParams } from '@angular/common/http';
+import { EMPTY, Observable } from 'rxjs';
+import { expand, reduce } from 'rxjs/operators';
 import { environment } from '@environments/environment.development';
 import {
   Employee,
@@ -15,10 +16,28 @@ import {
 export class EmployeeService {
   private apiUrl = `${environment.apiUrl}/api/employees`;
 
+  // Largest page the API accepts (MAX_PAGE_SIZE)
+  private pageSize = 1000;
+
   constructor(private http: HttpClient) {}
 
+  getPage(cursor?: string, limit = this.pageSize): Observable<EmployeeListResponse> {
+    let params = new HttpParams().set('limit', limit);
+    if (cursor) params = params.set('cursor', cursor);
+
+    return this.http.get<EmployeeListResponse>(this.apiUrl, { params });
+  }
+
+  // Follows next_cursor until the last page and returns every employee
   getAll(): Observable<EmployeeListResponse> {
-    return this.http.get<EmployeeListResponse>(this.apiUrl);
+    return this.getPage().pipe(
+      expand(page => page.next_cursor ? this.getPage(page.next_cursor) : EMPTY),
+      reduce((all, page) => ({
+        ...page,
+        count: all.count + page.count,
+        data: all.data.concat(page.data)
+      }))
+    );
   }
 
   getById(id: string): Observable<EmployeeResponse> {